@@ -0,0 +1,162 @@
+"""
+Build-time swing and trend analytics for the org-district sheets.
+
+Figures are read from the election history store (history_store.py), which
+the build refreshes from the sheets first, into a (category, metric, district)
+float matrix; swings, growth ratios, target gaps, ranks and percentiles are
+then derived with array operations across every category at once. The page
+never sees the "24.77%" style strings: the modal view-models (modal_view.py),
+the roll-ups and the static API are all formatted from these arrays at build
+time.
+
+Which years the metrics cover comes from the election catalog: every election
+with a vote share in the store gets votes_<year> / share_<year> and swings
+against the others, and the newest local-body election (the one with ward
+targets) and the one before it give the ward metrics. Adding an election to
+the store adds its trend row without code changes.
+"""
+import numpy as np
+
+import history_store
+
+# Sheets that make up the statewide "combined" view shown in the modal
+COMBINED_SHEETS = ['org_panchayat_30', 'municipality', 'corporation']
+
+def election_years(catalog=None, sheet_keys=None):
+    """{'trend': [(year, election id)] oldest first, 'current': (year, id), 'previous': (year, id) or None}"""
+    catalog = catalog if catalog is not None else history_store.load_catalog()
+    sheet_keys = sheet_keys or COMBINED_SHEETS
+
+    def has(election_id, measure):
+        return any(history_store.get_metric(election_id, f"{key}.{measure}") for key in sheet_keys)
+
+    ordered = sorted(catalog, key=lambda election: election['year'])
+    trend = [(str(election['year']), election['id']) for election in ordered if has(election['id'], 'vote_share')]
+    years = [year for year, _ in trend]
+    if len(set(years)) != len(years):
+        raise ValueError(f"more than one election per year in the trend: {', '.join(election_id for _, election_id in trend)}")
+    local_bodies = [(str(election['year']), election['id']) for election in ordered
+                    if election['kind'] == 'local_body' and has(election['id'], 'wards_won')]
+    if not trend or not local_bodies:
+        raise ValueError("the history store has no vote shares or ward results; run history_store.py import-sheets")
+    return {
+        'trend': trend,
+        'current': local_bodies[-1],
+        'previous': local_bodies[-2] if len(local_bodies) > 1 else None
+    }
+
+def base_sources(years):
+    """Base metric -> (election id, measure), in the order the metrics are published"""
+    (current_year, current), previous = years['current'], years['previous']
+    newest_first = years['trend'][::-1]
+    sources = {'total_wards': (current, 'total_wards'), f'wards_{current_year}': (current, 'wards_won'),
+               'target_wards': (current, 'target_wards')}
+    if previous:
+        sources[f'wards_{previous[0]}'] = (previous[1], 'wards_won')
+    sources.update({f'votes_{year}': (election_id, 'votes') for year, election_id in newest_first})
+    sources.update({f'share_{year}': (election_id, 'vote_share') for year, election_id in newest_first})
+    sources['target_share'] = (current, 'target_vote_share')
+    return sources
+
+def is_count(metric):
+    return metric in ('total_wards', 'target_wards') or metric.startswith(('wards_', 'votes_'))
+
+def build_base_matrix(district_names, sheet_keys, sources):
+    """Read every sheet's figures from the store into an array of shape (sheets, base metrics, districts)"""
+    matrix = np.full((len(sheet_keys), len(sources), len(district_names)), np.nan)
+    district_index = {name: d for d, name in enumerate(district_names)}
+    for s, sheet_key in enumerate(sheet_keys):
+        for m, (election_id, measure) in enumerate(sources.values()):
+            for entity, value in history_store.get_metric(election_id, f"{sheet_key}.{measure}").items():
+                if entity in district_index:
+                    matrix[s, m, district_index[entity]] = value
+    return matrix
+
+def combine_sheets(base, sheet_keys, base_metrics, current_year):
+    """Sum counts and vote-weight shares across the combined sheets (missing values count as 0)"""
+    metric_index = {metric: i for i, metric in enumerate(base_metrics)}
+    rows = np.nan_to_num(base[[sheet_keys.index(key) for key in COMBINED_SHEETS]])
+    combined = np.full(base.shape[1:], np.nan)
+    for metric in filter(is_count, base_metrics):
+        combined[metric_index[metric]] = rows[:, metric_index[metric]].sum(axis=0)
+    weights = {metric: f"votes_{metric[len('share_'):]}" for metric in base_metrics if metric.startswith('share_')}
+    weights['target_share'] = f"votes_{current_year}"
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for share, votes in weights.items():
+            total = rows[:, metric_index[votes]].sum(axis=0)
+            weighted = (rows[:, metric_index[share]] * rows[:, metric_index[votes]]).sum(axis=0)
+            combined[metric_index[share]] = np.where(total > 0, weighted / total, 0.0)
+    return combined
+
+def rank_and_percentile(values):
+    """Competition rank (1 = highest) and percentile per row, ignoring NaNs"""
+    ranks = np.full(values.shape, np.nan)
+    percentiles = np.full(values.shape, np.nan)
+    for c, row in enumerate(values):
+        valid = ~np.isnan(row)
+        n_valid = int(valid.sum())
+        if n_valid == 0:
+            continue
+        ordered = np.sort(row[valid])
+        above = n_valid - np.searchsorted(ordered, row[valid], side='right')
+        below = np.searchsorted(ordered, row[valid], side='left')
+        ranks[c, valid] = above + 1
+        percentiles[c, valid] = 100.0 * below / max(n_valid - 1, 1)
+    return ranks, percentiles
+
+def compute_analytics(district_names, sheet_keys, catalog=None):
+    """Compute every derived metric for all categories and districts in one pass"""
+    years = election_years(catalog)
+    sources = base_sources(years)
+    base_metrics = list(sources)
+    current = years['current'][0]
+    trend = [year for year, _ in years['trend']]
+    latest = trend[-1]
+    base = build_base_matrix(district_names, sheet_keys, sources)
+    categories = list(sheet_keys) + ['combined']
+    base = np.concatenate([base, combine_sheets(base, list(sheet_keys), base_metrics, current)[np.newaxis]], axis=0)
+
+    metrics = {metric: base[:, i, :] for i, metric in enumerate(base_metrics)}
+    newest_first = trend[::-1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for i, later in enumerate(newest_first):
+            for earlier in newest_first[i + 1:]:
+                metrics[f'swing_{later}_{earlier}'] = metrics[f'share_{later}'] - metrics[f'share_{earlier}']
+        for earlier in newest_first[1:]:
+            metrics[f'vote_growth_{latest}_{earlier}'] = np.where(
+                metrics[f'votes_{earlier}'] > 0, metrics[f'votes_{latest}'] / metrics[f'votes_{earlier}'], np.nan)
+        if years['previous']:
+            metrics['ward_gain'] = metrics[f'wards_{current}'] - metrics[f"wards_{years['previous'][0]}"]
+        metrics['target_gap'] = metrics['target_wards'] - metrics[f'wards_{current}']
+        metrics['target_attainment'] = np.where(metrics['target_wards'] > 0, metrics[f'wards_{current}'] / metrics['target_wards'], np.nan)
+
+    # Ranked across districts within each category (higher is better)
+    ranked = [f'share_{latest}'] + [f'swing_{latest}_{earlier}' for earlier in trend[:-1]] + ['target_attainment']
+    for metric in ranked:
+        metrics[f'rank_{metric}'], metrics[f'percentile_{metric}'] = rank_and_percentile(metrics[metric])
+
+    return {
+        'districts': list(district_names),
+        'categories': categories,
+        # Trend years oldest first; current / previous are the local-body elections behind the ward metrics
+        'years': trend,
+        'current_year': current,
+        'previous_year': years['previous'][0] if years['previous'] else None,
+        'base_metrics': base_metrics,
+        'ranked_metrics': ranked,
+        'metrics': metrics
+    }
+
+def metric_digits(metric):
+    if is_count(metric) or metric.startswith('rank_') or metric in ('ward_gain', 'target_gap'):
+        return 0
+    if metric.startswith('percentile_'):
+        return 2
+    return 4
+
+def to_compact_array(values, digits):
+    """Round a float array to a JSON list, with NaN as null and whole numbers as ints"""
+    rounded = np.round(values, digits)
+    if digits == 0:
+        return [None if np.isnan(v) else int(v) for v in rounded]
+    return [None if np.isnan(v) else float(v) for v in rounded]
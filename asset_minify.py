@@ -0,0 +1,259 @@
+"""
+Offline CSS / JS / HTML minification for the generated pages (no Node toolchain).
+
+- CSS: comments and whitespace are stripped, and rules whose class / id selectors
+  never appear in the page markup or scripts are dropped (leaflet-* classes come
+  from Leaflet itself and are always kept).
+- JS: comments, indentation and the spaces around punctuation are stripped;
+  line breaks that could end a statement are kept, so automatic semicolon
+  insertion behaves as before. Strings, regex literals and template literals
+  (the modal markup) are left byte for byte. Function declarations that
+  nothing references are removed.
+- HTML: comments, indentation and blank lines go; <style> and inline <script>
+  blocks are minified with the whole page as the usage corpus.
+"""
+import re
+
+KEPT_CLASS_PREFIXES = ('leaflet-',)
+
+REGEX_PRECEDERS = set('(,=:[!&|?{};+-*%<>~^')
+REGEX_KEYWORDS = {'return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'new', 'delete', 'void', 'throw'}
+JS_PUNCTUATION = re.compile(r' ?([{}()\[\];,:=]) ?')
+
+# ---------------------------------------------------------------- JavaScript
+
+def skip_string(source, i):
+    quote = source[i]
+    i += 1
+    while source[i] != quote:
+        i += 2 if source[i] == '\\' else 1
+    return i + 1
+
+def skip_regex(source, i):
+    i += 1
+    in_class = False
+    while True:
+        char = source[i]
+        if char == '\\':
+            i += 2
+            continue
+        if char == '[':
+            in_class = True
+        elif char == ']':
+            in_class = False
+        elif char == '/' and not in_class:
+            i += 1
+            while i < len(source) and (source[i].isalnum() or source[i] == '_'):
+                i += 1
+            return i
+        i += 1
+
+def skip_template(source, i):
+    i += 1
+    while source[i] != '`':
+        if source[i] == '\\':
+            i += 2
+        elif source.startswith('${', i):
+            _, i = tokenize_js(source, i + 2, stop_at_brace=True)
+            i += 1
+        else:
+            i += 1
+    return i + 1
+
+def regex_allowed(code):
+    """Whether a '/' after this code starts a regex literal (None: right after a literal, so a division)"""
+    if code is None:
+        return False
+    stripped = code.rstrip()
+    if not stripped:
+        return True
+    if stripped[-1] in REGEX_PRECEDERS:
+        return True
+    word = re.search(r'[A-Za-z_$][\w$]*$', stripped)
+    return bool(word) and word.group() in REGEX_KEYWORDS
+
+def tokenize_js(source, i=0, stop_at_brace=False):
+    """[(kind, text)] with kind code / literal; comments are dropped"""
+    tokens = []
+    code = []
+    depth = 0
+    n = len(source)
+
+    def flush():
+        if code:
+            tokens.append(('code', ''.join(code)))
+            code.clear()
+
+    while i < n:
+        char = source[i]
+        if char in '\'"':
+            end = skip_string(source, i)
+        elif char == '`':
+            end = skip_template(source, i)
+        elif source.startswith('//', i):
+            end = source.find('\n', i)
+            i = n if end == -1 else end
+            continue
+        elif source.startswith('/*', i):
+            i = source.index('*/', i) + 2
+            code.append(' ')
+            continue
+        elif char == '/' and regex_allowed(''.join(code) if code or not tokens else None):
+            end = skip_regex(source, i)
+        else:
+            if stop_at_brace:
+                if char == '{':
+                    depth += 1
+                elif char == '}':
+                    if depth == 0:
+                        flush()
+                        return tokens, i
+                    depth -= 1
+            code.append(char)
+            i += 1
+            continue
+        flush()
+        tokens.append(('literal', source[i:end]))
+        i = end
+    flush()
+    return tokens, i
+
+def squeeze_code(code):
+    code = re.sub(r'[ \t]+', ' ', code)
+    code = re.sub(r' ?\n\s*', '\n', code)
+    code = JS_PUNCTUATION.sub(r'\1', code)
+    # Line breaks after an opener or separator, or before a closer, never end a statement
+    code = re.sub(r'([{(\[;,])\n', r'\1', code)
+    return re.sub(r'\n([})\]])', r'\1', code)
+
+def body_end(tokens, index, position):
+    """(token index, offset) of the brace closing the first block opened at or after position"""
+    depth = 0
+    for token_index in range(index, len(tokens)):
+        kind, text = tokens[token_index]
+        if kind != 'code':
+            continue
+        for offset in range(position if token_index == index else 0, len(text)):
+            if text[offset] == '{':
+                depth += 1
+            elif text[offset] == '}':
+                depth -= 1
+                if depth == 0:
+                    return token_index, offset
+    raise ValueError("unbalanced braces in script")
+
+def unused_declaration(tokens, corpus):
+    for index, (kind, text) in enumerate(tokens):
+        if kind != 'code':
+            continue
+        for match in re.finditer(r'(?<![\w$.])function\s+([A-Za-z_$][\w$]*)\s*\(', text):
+            if len(re.findall(r'(?<![\w$])' + re.escape(match.group(1)) + r'(?![\w$])', corpus)) == 1:
+                return index, match
+    return None
+
+def remove_unused_functions(tokens, corpus):
+    """Drop `function name(...) {...}` declarations whose name appears nowhere else in corpus"""
+    while True:
+        found = unused_declaration(tokens, corpus)
+        if not found:
+            return tokens
+        index, match = found
+        end_index, offset = body_end(tokens, index, match.end())
+        merged = tokens[index][1][:match.start()] + tokens[end_index][1][offset + 1:]
+        tokens = tokens[:index] + [('code', merged)] + tokens[end_index + 1:]
+
+def minify_js(source, corpus=None):
+    tokens, _ = tokenize_js(source)
+    tokens = remove_unused_functions(tokens, corpus if corpus is not None else source)
+    parts = [squeeze_code(text) if kind == 'code' else text for kind, text in tokens]
+    return ''.join(parts).strip() + '\n'
+
+# ---------------------------------------------------------------- CSS
+
+def used_tokens(corpus):
+    return set(re.findall(r'[A-Za-z_][\w-]*', corpus))
+
+def selector_used(selector, words):
+    if words is None:
+        return True
+    for token in re.findall(r'[.#](-?[A-Za-z_][\w-]*)', re.sub(r'\[[^\]]*\]|::?[\w-]+(\([^)]*\))?', '', selector)):
+        if token.startswith(KEPT_CLASS_PREFIXES):
+            continue
+        if token not in words:
+            return False
+    return True
+
+def split_rules(css):
+    """Top-level [(prelude, body)] pairs, body being the text between the braces"""
+    rules = []
+    depth = 0
+    start = 0
+    prelude = None
+    for i, char in enumerate(css):
+        if char == '{':
+            if depth == 0:
+                prelude = css[start:i].strip()
+                start = i + 1
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                rules.append((prelude, css[start:i]))
+                start = i + 1
+    return rules
+
+def squeeze_declarations(body):
+    body = re.sub(r'\s+', ' ', body).strip()
+    body = re.sub(r'\s*([;:,])\s*', r'\1', body)
+    body = re.sub(r'\s*!important', '!important', body)
+    return body.rstrip(';')
+
+def minify_rules(css, words, removed):
+    out = []
+    for prelude, body in split_rules(css):
+        prelude = re.sub(r'\s+', ' ', prelude)
+        if prelude.startswith(('@media', '@supports')):
+            inner = minify_rules(body, words, removed)
+            if inner:
+                out.append(re.sub(r':\s+', ':', prelude) + '{' + inner + '}')
+        elif prelude.startswith('@'):
+            frames = ''.join(step + '{' + squeeze_declarations(decls) + '}' for step, decls in split_rules(body))
+            out.append(prelude + '{' + frames + '}')
+        else:
+            selectors = [selector.strip() for selector in prelude.split(',')]
+            kept = [selector for selector in selectors if selector_used(selector, words)]
+            removed.extend(selector for selector in selectors if selector not in kept)
+            if kept:
+                kept = [re.sub(r'\s*([>+~])\s*', r'\1', selector) for selector in kept]
+                out.append(f"{','.join(kept)}{{{squeeze_declarations(body)}}}")
+    return ''.join(out)
+
+def minify_css(css, corpus=None, removed=None):
+    """Minified CSS without the rules whose selectors match nothing in corpus (all kept without one)"""
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    words = used_tokens(corpus) if corpus is not None else None
+    return minify_rules(css, words, removed if removed is not None else []) + '\n'
+
+# ---------------------------------------------------------------- HTML
+
+BLOCK = re.compile(r'(<style>)(.*?)(</style>)|(<script>)(.*?)(</script>)', re.S)
+
+def minify_html(html, removed=None):
+    """Minify markup plus every <style> and inline <script> block, using the page as corpus"""
+    corpus = re.sub(r'<style>.*?</style>', '', html, flags=re.S)
+    parts = []
+    position = 0
+    for match in BLOCK.finditer(html):
+        parts.append(squeeze_markup(html[position:match.start()]))
+        if match.group(1):
+            parts.append('<style>' + minify_css(match.group(2), corpus, removed).strip() + '</style>')
+        else:
+            parts.append('<script>' + minify_js(match.group(5), corpus).strip() + '</script>')
+        position = match.end()
+    parts.append(squeeze_markup(html[position:]))
+    return ''.join(parts)
+
+def squeeze_markup(markup):
+    markup = re.sub(r'<!--.*?-->', '', markup, flags=re.S)
+    lines = (line.strip() for line in markup.split('\n'))
+    return '\n'.join(line for line in lines if line) + ('\n' if markup.endswith('\n') else '')
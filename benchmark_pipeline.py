@@ -0,0 +1,268 @@
+"""
+Pipeline benchmarks: every stage of generate_kerala_map_final.py timed on its
+own, per district and for the whole state.
+
+    json_load              read and parse the hierarchy file
+    feature_extraction     extract_all_features
+    local_body_extraction  extract_local_bodies
+    geometry_merge         merge_features_to_boundary (buffer / union / simplify)
+    metric_computation     per district: vote-share data and modal view-model;
+                           state: analytics, view-models and roll-ups
+    serialization          per district: its encoded page record as JSON;
+                           state: page_contexts (json.dumps of all_districts_data)
+    html_write             state only: render and write every page (to a temp dir)
+
+Each stage runs --warmup times untimed, then --repeat times; the summary gives
+min / median / mean / stdev / max in milliseconds. Results are appended to
+benchmark_history.json together with the commit and the merge parameters, and
+each run is compared with the previous one:
+
+    python benchmark_pipeline.py --repeat 5
+    python benchmark_pipeline.py --districts "Kozhikode City" --stages geometry_merge
+
+--data-dir reads the hierarchy files and result CSVs from another directory,
+e.g. one written by synthetic_data.py, to benchmark at 10x or 100x scale:
+
+    python synthetic_data.py --scale 10
+    python benchmark_pipeline.py --data-dir synthetic/10x --no-history
+"""
+import argparse
+import contextlib
+import io
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import analytics
+import geometry_codec
+import history_store
+import label_layout
+import modal_view
+import page_templates
+import payload_shaping
+import result_sheets
+import rollups
+import generate_kerala_map_final as pipeline
+
+history_path = Path(__file__).parent / "benchmark_history.json"
+
+STAGES = ['json_load', 'feature_extraction', 'local_body_extraction', 'geometry_merge',
+          'metric_computation', 'serialization', 'html_write']
+# A later run whose median is this much slower than the previous one is flagged
+REGRESSION_RATIO = 1.10
+
+def time_runs(fn, repeat, warmup):
+    """Durations in ms of `repeat` calls of fn after `warmup` untimed calls; pipeline prints are discarded"""
+    durations = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(warmup):
+            fn()
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            durations.append((time.perf_counter() - start) * 1000)
+    return durations
+
+def summarize(durations):
+    return {
+        'runs': len(durations),
+        'min': min(durations),
+        'median': statistics.median(durations),
+        'mean': statistics.fmean(durations),
+        'stdev': statistics.stdev(durations) if len(durations) > 1 else 0.0,
+        'max': max(durations)
+    }
+
+def load_inputs(district_names):
+    """Everything the stages start from, loaded once outside the timings"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        all_csv_data = result_sheets.load_csv_data()
+        result_data = result_sheets.load_result_data()
+        results_2025_data = result_sheets.load_results_2025_data()
+    hierarchies, records, memberships = {}, [], []
+    for name in district_names:
+        path = result_sheets.hierarchy_path(name)
+        if not path.exists():
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            hierarchies[name] = json.load(f)
+        with contextlib.redirect_stdout(io.StringIO()):
+            records.append(pipeline.build_district_record(
+                name, hierarchies[name], all_csv_data.get(name, {}), result_data.get(name, {}), results_2025_data.get(name, {})))
+        memberships.extend(rollups.extract_membership(name, hierarchies[name]))
+    analytics_result = analytics.compute_analytics(result_sheets.districts, list(result_sheets.csv_files))
+    views = modal_view.build_view_models(records, analytics_result)
+    records = [{**record, 'view': views[record['name']]} for record in records]
+    return {
+        'csv': all_csv_data, 'result': result_data, 'hierarchies': hierarchies, 'records': records,
+        'memberships': memberships, 'analytics': analytics_result
+    }
+
+def district_stages(name, inputs):
+    """{stage: callable} for one district"""
+    data = inputs['hierarchies'][name]
+    features = pipeline.extract_all_features(data)
+    record = next(record for record in inputs['records'] if record['name'] == name)
+    analytics_result = inputs['analytics']
+    category_index = analytics_result['categories'].index(modal_view.MODAL_CATEGORY)
+    district_index = analytics_result['districts'].index(name) if name in analytics_result['districts'] else None
+
+    def json_load():
+        with open(result_sheets.hierarchy_path(name), 'r', encoding='utf-8') as f:
+            json.load(f)
+
+    def metric_computation():
+        pipeline.build_vote_share_data(inputs['csv'].get(name, {}), inputs['result'].get(name, {}))
+        modal_view.build_view_model(record, analytics_result, category_index, district_index)
+
+    def serialization():
+        shaped = {**payload_shaping.shape_record(record), 'geojson': geometry_codec.encode_geojson(record['geojson'])}
+        json.dumps(shaped, ensure_ascii=False)
+
+    return {
+        'json_load': json_load,
+        'feature_extraction': lambda: pipeline.extract_all_features(data),
+        'local_body_extraction': lambda: pipeline.extract_local_bodies(data),
+        'geometry_merge': lambda: pipeline.merge_features_to_boundary(features),
+        'metric_computation': metric_computation,
+        'serialization': serialization
+    }
+
+def state_stages(inputs, output_dir):
+    """{stage: callable} for the whole state"""
+    hierarchies = inputs['hierarchies']
+    features = {name: pipeline.extract_all_features(data) for name, data in hierarchies.items()}
+    records = inputs['records']
+    labels = label_layout.layout_labels(records)
+    trend_years = modal_view.trend_years(inputs['analytics'])
+    contexts = pipeline.page_contexts(records, labels, trend_years)
+
+    def json_load():
+        for name in hierarchies:
+            with open(result_sheets.hierarchy_path(name), 'r', encoding='utf-8') as f:
+                json.load(f)
+
+    def metric_computation():
+        analytics_result = analytics.compute_analytics(result_sheets.districts, list(result_sheets.csv_files))
+        modal_view.build_view_models(records, analytics_result)
+        rollups.compute_rollups(inputs['memberships'], analytics_result)
+
+    def html_write():
+        for page, spec in pipeline.PAGES.items():
+            html = page_templates.render(spec['template'], contexts[page], True)
+            (output_dir / f"{page}.html").write_bytes(html.encode('utf-8'))
+
+    return {
+        'json_load': json_load,
+        'feature_extraction': lambda: [pipeline.extract_all_features(data) for data in hierarchies.values()],
+        'local_body_extraction': lambda: [pipeline.extract_local_bodies(data) for data in hierarchies.values()],
+        'geometry_merge': lambda: [pipeline.merge_features_to_boundary(items) for items in features.values()],
+        'metric_computation': metric_computation,
+        'serialization': lambda: pipeline.page_contexts(records, labels, trend_years),
+        'html_write': html_write
+    }
+
+def run_stages(stages, selected, repeat, warmup):
+    return {stage: summarize(time_runs(stages[stage], repeat, warmup)) for stage in selected if stage in stages}
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=Path(__file__).parent,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def load_history(path=history_path):
+    if not Path(path).exists():
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def save_history(history, path=history_path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(history, f, indent=2)
+        f.write('\n')
+
+def print_table(title, results, previous=None):
+    print(f"\n{title}")
+    print(f"  {'stage':<22} {'median':>10} {'mean':>10} {'stdev':>9} {'min':>10} {'max':>10}  vs previous")
+    for stage, stats in results.items():
+        change = ''
+        before = (previous or {}).get(stage)
+        if before and before['median'] > 0:
+            ratio = stats['median'] / before['median']
+            change = f"{(ratio - 1) * 100:+.1f}%" + ('  ✗ slower' if ratio > REGRESSION_RATIO else '')
+        print(f"  {stage:<22} {stats['median']:>10.2f} {stats['mean']:>10.2f} {stats['stdev']:>9.2f} "
+              f"{stats['min']:>10.2f} {stats['max']:>10.2f}  {change}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Time every pipeline stage per district and for the whole state")
+    parser.add_argument('--repeat', type=int, default=5, help="timed runs per stage (default: %(default)s)")
+    parser.add_argument('--warmup', type=int, default=1, help="untimed runs before timing (default: %(default)s)")
+    parser.add_argument('--districts', help="comma-separated district names (default: every district with a hierarchy file)")
+    parser.add_argument('--stages', default=','.join(STAGES), help="comma-separated stages (default: all)")
+    parser.add_argument('--history', type=Path, default=history_path, help="JSON history file (default: %(default)s)")
+    parser.add_argument('--no-history', action='store_true', help="print the results without appending them")
+    parser.add_argument('--data-dir', type=Path, help="read hierarchy files and result CSVs from here (e.g. synthetic_data.py output)")
+    args = parser.parse_args()
+
+    selected = [stage.strip() for stage in args.stages.split(',') if stage.strip()]
+    unknown = [stage for stage in selected if stage not in STAGES]
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(unknown)}; choose from {', '.join(STAGES)}")
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+    if args.data_dir:
+        result_sheets.base_dir = args.data_dir / result_sheets.base_dir.name
+        result_sheets.csv_dir = args.data_dir
+        # Synthetic sheets get a store of their own next to them, never the committed history/
+        history_store.history_dir = args.data_dir / 'history'
+        with contextlib.redirect_stdout(io.StringIO()):
+            history_store.import_sheets(result_sheets.csv_dir, result_sheets.csv_files, result_sheets.result_csv_file)
+    names = [name.strip() for name in args.districts.split(',')] if args.districts else result_sheets.districts
+
+    inputs = load_inputs(names)
+    if not inputs['hierarchies']:
+        print("✗ No hierarchy files found for the selected districts")
+        sys.exit(1)
+    print(f"✓ Benchmarking {len(inputs['hierarchies'])} districts, {args.repeat} runs per stage after {args.warmup} warm-up")
+
+    history = [] if args.no_history else load_history(args.history)
+    data_dir = str(args.data_dir) if args.data_dir else None
+    # Compare against the last run on the same data only
+    previous = next((run for run in reversed(history) if run.get('data_dir') == data_dir), None)
+
+    district_results = {}
+    for name in inputs['hierarchies']:
+        district_results[name] = run_stages(district_stages(name, inputs), selected, args.repeat, args.warmup)
+        print_table(name, district_results[name], previous and previous['districts'].get(name))
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        state_results = run_stages(state_stages(inputs, Path(output_dir)), selected, args.repeat, args.warmup)
+    print_table(f"State ({len(inputs['hierarchies'])} districts)", state_results, previous and previous['state'])
+
+    if args.no_history:
+        return
+    history.append({
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': args.repeat,
+        'warmup': args.warmup,
+        'merge_params': pipeline.MERGE_PARAMS,
+        'data_dir': data_dir,
+        'state': state_results,
+        'districts': district_results
+    })
+    save_history(history, args.history)
+    print(f"\n✅ Results appended to {args.history} ({len(history)} runs)")
+
+if __name__ == '__main__':
+    main()
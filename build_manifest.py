@@ -0,0 +1,104 @@
+"""
+Build manifest for incremental map generation.
+
+Records a content fingerprint for every input (CSV sheets, hierarchy JSONs,
+the generator script), one fingerprint per district covering everything that
+feeds its record, and the hash of each written output. Per-district records
+(the page record, local-body membership rows) are cached next to the manifest
+so unchanged districts are never recomputed.
+"""
+import hashlib
+import json
+from pathlib import Path
+
+root_dir = Path(__file__).parent
+resolved_root_dir = root_dir.resolve()
+cache_dir = root_dir / ".build_cache"
+manifest_path = cache_dir / "manifest.json"
+
+def empty_manifest():
+    return {'files': {}, 'districts': {}, 'inputs': None, 'outputs': {}}
+
+def load_manifest():
+    if manifest_path.exists():
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            return {**empty_manifest(), **manifest}
+        except (OSError, ValueError):
+            print(f"  ✗ Ignoring unreadable manifest: {manifest_path}")
+    return empty_manifest()
+
+def save_manifest(manifest):
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+def hash_bytes(data):
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+def hash_value(value):
+    """Fingerprint any JSON-serializable value independent of dict ordering"""
+    return hash_bytes(json.dumps(value, sort_keys=True, ensure_ascii=False).encode('utf-8'))
+
+def file_key(path):
+    try:
+        return str(Path(path).resolve().relative_to(resolved_root_dir))
+    except ValueError:
+        return str(path)
+
+def hash_file(path, previous=None):
+    """Fingerprint a file, reusing the previous hash when size and mtime are unchanged"""
+    stat = Path(path).stat()
+    if previous and previous.get('size') == stat.st_size and previous.get('mtime_ns') == stat.st_mtime_ns:
+        return previous
+    return {
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'hash': hash_bytes(Path(path).read_bytes())
+    }
+
+def hash_files(paths, previous_files):
+    keys = {path: file_key(path) for path in paths}
+    return {key: hash_file(path, previous_files.get(key)) for path, key in keys.items()}
+
+def output_unchanged(manifest, path, expected_hash=None):
+    """True when the output on disk still matches the manifest (and expected_hash, if given)"""
+    entry = manifest['outputs'].get(file_key(path))
+    if not entry or not Path(path).exists():
+        return False
+    if expected_hash is not None and entry['hash'] != expected_hash:
+        return False
+    return hash_file(path, entry)['hash'] == entry['hash']
+
+def slugify(name):
+    return name.lower().replace(' ', '-')
+
+def record_path(district_name, kind='districts'):
+    return cache_dir / kind / f"{slugify(district_name)}.json"
+
+def load_record(district_name, kind='districts'):
+    path = record_path(district_name, kind)
+    if not path.exists():
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def save_record(district_name, record, kind='districts'):
+    path = record_path(district_name, kind)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(record, f, ensure_ascii=False)
+
+def write_if_changed(path, data, manifest, outputs):
+    """Write bytes unless the manifest shows identical content on disk; records the output entry"""
+    changed = not output_unchanged(manifest, path, hash_bytes(data))
+    if changed:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(data)
+    outputs[file_key(path)] = hash_file(path)
+    return changed
@@ -0,0 +1,73 @@
+"""
+Drilldown layers: the local bodies and wards of one org district.
+
+They are built from the hierarchy file together with the district record and
+cached next to it in .build_cache. The split build writes one encoded file
+per district (data/drilldown/<slug>.<hash>.json) and lists it in
+overview.json. The page fetches that file only when the district is clicked,
+and drops it again when the map is zoomed back out.
+
+Ward properties are cut down to the fields the page shows. The survey files
+also carry surveyor names and phone numbers, which must not be published.
+"""
+from shapely.geometry import shape, mapping
+from shapely.ops import unary_union
+
+from geometry_codec import GEOMETRY_PRECISION, encode_geojson
+
+# Simplification per layer (degrees): local-body outlines are drawn over the
+# wards, so they can be coarser
+LOCAL_BODY_TOLERANCE = 0.0004
+WARD_TOLERANCE = 0.0001
+
+def layer_feature(geometry, properties):
+    return {'type': 'Feature', 'properties': properties, 'geometry': mapping(geometry)}
+
+def valid_shape(geometry):
+    geom = shape(geometry)
+    return geom if geom.is_valid else geom.buffer(0)
+
+def build_layers(data, local_body_tolerance=LOCAL_BODY_TOLERANCE, ward_tolerance=WARD_TOLERANCE):
+    """{'local_bodies': FeatureCollection, 'wards': FeatureCollection} for one hierarchy file"""
+    local_bodies, wards = [], []
+    for zone in data.get('zones', []):
+        for district in zone.get('districts', []):
+            for ac in district.get('assembly_constituencies', []):
+                for lsgi in ac.get('lsgi_types', []):
+                    for lb in lsgi.get('local_bodies', []):
+                        code = lb.get('code', '')
+                        shapes = []
+                        for feature in (lb.get('geojson') or {}).get('features') or []:
+                            if not feature.get('geometry'):
+                                continue
+                            geom = valid_shape(feature['geometry'])
+                            if geom.is_empty:
+                                continue
+                            shapes.append(geom)
+                            properties = feature.get('properties') or {}
+                            wards.append(layer_feature(geom.simplify(ward_tolerance, preserve_topology=True), {
+                                'code': code,
+                                'ward_no': str(properties.get('Ward_No', '') or ''),
+                                'ward_name': properties.get('Ward_Name', '') or ''
+                            }))
+                        if shapes:
+                            outline = unary_union(shapes).simplify(local_body_tolerance, preserve_topology=True)
+                            local_bodies.append(layer_feature(outline, {
+                                'code': code,
+                                'name': lb.get('name', ''),
+                                'lsgi_type': lsgi.get('lsgi_type', '').upper(),
+                                'ac': ac.get('ac_name', ''),
+                                'ward_count': lb.get('ward_count', 0) or 0
+                            }))
+    return {
+        'local_bodies': {'type': 'FeatureCollection', 'features': local_bodies},
+        'wards': {'type': 'FeatureCollection', 'features': wards}
+    }
+
+def encode_layers(name, layers, precision=GEOMETRY_PRECISION):
+    """Page payload for one district's drilldown file"""
+    return {
+        'name': name,
+        'local_bodies': encode_geojson(layers['local_bodies'], precision),
+        'wards': encode_geojson(layers['wards'], precision)
+    }
@@ -0,0 +1,142 @@
+"""
+Compact geometry encoding for the browser payload.
+
+Coordinates are quantized to a 10^-precision degree grid (5 decimals is about
+1.1 m, far below a pixel at zoom 12), consecutive duplicates are dropped, and
+each ring is written as zigzag deltas in the polyline character format: 5 bits
+per character, offset by 63 so the result is a plain JSON string. An encoded
+FeatureCollection keeps its properties and nesting but replaces every ring's
+coordinate list with one string; decodeGeoJSON (templates/geometry_decoder.js)
+turns it back into GeoJSON for Leaflet.
+
+Every encoded feature, and the collection, also carries a GeoJSON bbox
+([west, south, east, north] on the same grid), so the page can hit-test and
+cull without decoding or scanning the rings.
+"""
+GEOMETRY_PRECISION = 5
+ENCODING = 'polyline'
+
+# Geometry type -> nesting depth above the ring level
+RING_DEPTH = {'LineString': 0, 'Polygon': 1, 'MultiLineString': 1, 'MultiPolygon': 2}
+
+def encode_value(value, chars):
+    value = ~(value << 1) if value < 0 else value << 1
+    while value >= 0x20:
+        chars.append(chr((0x20 | (value & 0x1f)) + 63))
+        value >>= 5
+    chars.append(chr(value + 63))
+
+def quantize_ring(points, factor):
+    quantized = []
+    for point in points:
+        q = (round(point[0] * factor), round(point[1] * factor))
+        if not quantized or q != quantized[-1]:
+            quantized.append(q)
+    return quantized
+
+def encode_ring(points, precision=GEOMETRY_PRECISION):
+    factor = 10 ** precision
+    chars = []
+    previous_x = previous_y = 0
+    for x, y in quantize_ring(points, factor):
+        encode_value(x - previous_x, chars)
+        encode_value(y - previous_y, chars)
+        previous_x, previous_y = x, y
+    return ''.join(chars)
+
+def decode_ring(encoded, precision=GEOMETRY_PRECISION):
+    factor = 10 ** precision
+    values = []
+    result = shift = 0
+    for char in encoded:
+        byte = ord(char) - 63
+        result |= (byte & 0x1f) << shift
+        shift += 5
+        if byte < 0x20:
+            values.append(~(result >> 1) if result & 1 else result >> 1)
+            result = shift = 0
+    points = []
+    x = y = 0
+    for dx, dy in zip(values[0::2], values[1::2]):
+        x += dx
+        y += dy
+        points.append([x / factor, y / factor])
+    return points
+
+def map_rings(coordinates, depth, transform):
+    if depth == 0:
+        return transform(coordinates)
+    return [map_rings(part, depth - 1, transform) for part in coordinates]
+
+def encode_geometry(geometry, precision=GEOMETRY_PRECISION):
+    depth = RING_DEPTH.get(geometry.get('type'))
+    if depth is None:
+        return geometry
+    return {'type': geometry['type'], 'coordinates': map_rings(geometry['coordinates'], depth, lambda ring: encode_ring(ring, precision))}
+
+def decode_geometry(geometry, precision=GEOMETRY_PRECISION):
+    depth = RING_DEPTH.get(geometry.get('type'))
+    if depth is None:
+        return geometry
+    return {'type': geometry['type'], 'coordinates': map_rings(geometry['coordinates'], depth, lambda ring: decode_ring(ring, precision))}
+
+def geometry_bbox(geometry, precision=GEOMETRY_PRECISION):
+    """[west, south, east, north] of the quantized rings, or None for an empty / point geometry"""
+    depth = RING_DEPTH.get(geometry.get('type')) if geometry else None
+    if depth is None:
+        return None
+    factor = 10 ** precision
+    xs, ys = [], []
+
+    def collect(ring):
+        for x, y in quantize_ring(ring, factor):
+            xs.append(x)
+            ys.append(y)
+
+    map_rings(geometry['coordinates'], depth, collect)
+    if not xs:
+        return None
+    return [round(value / factor, precision) for value in (min(xs), min(ys), max(xs), max(ys))]
+
+def union_bbox(boxes):
+    boxes = [box for box in boxes if box]
+    if not boxes:
+        return None
+    return [min(box[0] for box in boxes), min(box[1] for box in boxes),
+            max(box[2] for box in boxes), max(box[3] for box in boxes)]
+
+def encode_feature(feature, precision=GEOMETRY_PRECISION):
+    geometry = feature.get('geometry')
+    encoded = {**feature, 'geometry': encode_geometry(geometry, precision) if geometry else None}
+    bbox = geometry_bbox(geometry, precision)
+    if bbox:
+        encoded['bbox'] = bbox
+    return encoded
+
+def encode_geojson(geojson, precision=GEOMETRY_PRECISION):
+    """Encoded copy of a FeatureCollection (properties untouched, bboxes added)"""
+    features = [encode_feature(feature, precision) for feature in geojson.get('features', [])]
+    encoded = {
+        'type': 'FeatureCollection',
+        'encoding': ENCODING,
+        'precision': precision,
+        'features': features
+    }
+    bbox = union_bbox(feature.get('bbox') for feature in features)
+    if bbox:
+        encoded['bbox'] = bbox
+    return encoded
+
+def decode_geojson(geojson):
+    if geojson.get('encoding') != ENCODING:
+        return geojson
+    decoded = {
+        'type': 'FeatureCollection',
+        'features': [
+            {**feature, 'geometry': decode_geometry(feature['geometry'], geojson['precision']) if feature.get('geometry') else None}
+            for feature in geojson.get('features', [])
+        ]
+    }
+    if 'bbox' in geojson:
+        decoded['bbox'] = geojson['bbox']
+    return decoded
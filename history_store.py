@@ -0,0 +1,330 @@
+"""
+Append-only, long-format history of election results.
+
+Every figure is one (entity, level, election, metric, value) record. Records
+are stored in one CSV partition per election under history/, next to an
+elections.json catalog, and are only ever appended: a later record for the
+same (entity, level, metric) supersedes the earlier one when the partition is
+read, and a record with an empty value withdraws the figure. Each partition is
+indexed on load by key and by (level, metric), so comparing any two elections
+touches only those two partitions.
+
+The store is what analytics.py reads, and the elections in the catalog decide
+which years the trend, swing and roll-up metrics cover. The build only reads
+it: when the sheets hold figures the store does not, it says so, and
+`import-sheets` (after the sheets pass `--validate`) brings the store up to
+date in a commit of its own.
+
+Adding an election (a by-election, the 2026 assembly results) is a catalog
+entry plus an appended partition - no parser or template changes:
+
+    python history_store.py append --election ac-2026 --name "Assembly Election 2026" \\
+        --kind assembly --year 2026 results_2026_long.csv
+    python history_store.py compare lsg-2025 ac-2026 org_panchayat_30.vote_share
+
+The current wide sheets (2020 / 2024 / 2025 columns) are imported with
+`python history_store.py import-sheets`; only changed values are appended.
+Counts (wards, votes, local bodies) must be whole numbers: a value such as
+'18.21%' in a votes column is reported and not stored.
+"""
+import argparse
+import csv
+import json
+from pathlib import Path
+
+# Set by benchmark_pipeline.py --data-dir so synthetic sheets get a store of their own
+history_dir = Path(__file__).parent / "history"
+
+RECORD_FIELDS = ['entity', 'level', 'metric', 'value']
+
+# Elections carried by the current result sheets
+SHEET_ELECTIONS = [
+    {'id': 'lsg-2020', 'name': 'Local Body Election 2020', 'kind': 'local_body', 'year': 2020},
+    {'id': 'ls-2024', 'name': 'Lok Sabha Election 2024', 'kind': 'lok_sabha', 'year': 2024},
+    {'id': 'lsg-2025', 'name': 'Local Body Election 2025', 'kind': 'local_body', 'year': 2025}
+]
+
+# Wide sheet column -> (election id, measure). The only place year-named columns are interpreted.
+SHEET_COLUMNS = {
+    'Total Wards 2025': ('lsg-2025', 'total_wards'),
+    'NDA - 2025 Result Wards': ('lsg-2025', 'wards_won'),
+    'Target Wards': ('lsg-2025', 'target_wards'),
+    'NDA 2025 Vote': ('lsg-2025', 'votes'),
+    '2025 Vote Share': ('lsg-2025', 'vote_share'),
+    'Target Vote Share': ('lsg-2025', 'target_vote_share'),
+    '2024 Votes': ('ls-2024', 'votes'),
+    '2024 Vote Share': ('ls-2024', 'vote_share'),
+    'NDA - 2020 Wards': ('lsg-2020', 'wards_won'),
+    '2020 Votes': ('lsg-2020', 'votes'),
+    '2020 Vote Share': ('lsg-2020', 'vote_share')
+}
+
+# Result.csv column -> measure (all lsg-2025 local-body counts)
+RESULT_COLUMNS = {
+    'GP First Without Tie': 'gp_first_without_tie',
+    'GP First Tie': 'gp_first_tie',
+    'GP Second Without Tie': 'gp_second_without_tie',
+    'GP Second Tie': 'gp_second_tie',
+    'Municipality First ': 'municipality_first',
+    'Municipality 2nd Without Tie': 'municipality_second_without_tie',
+    'Municipality 2nd With Tie': 'municipality_second_with_tie',
+    'Corporation 1st': 'corporation_first'
+}
+
+# Measures that are whole numbers
+COUNT_MEASURES = {'total_wards', 'wards_won', 'target_wards', 'votes'} | set(RESULT_COLUMNS.values())
+
+STATE_ENTITY = 'Kerala'
+
+_partitions = {}
+
+def catalog_path():
+    return history_dir / "elections.json"
+
+def load_catalog():
+    if not catalog_path().exists():
+        return []
+    with open(catalog_path(), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def register_election(election):
+    """Add an election to the catalog; an existing id must carry the same metadata"""
+    catalog = load_catalog()
+    for existing in catalog:
+        if existing['id'] == election['id']:
+            if existing != election:
+                raise ValueError(f"election {election['id']} is already registered as {existing}")
+            return False
+    history_dir.mkdir(parents=True, exist_ok=True)
+    with open(catalog_path(), 'w', encoding='utf-8') as f:
+        json.dump(catalog + [election], f, indent=2, ensure_ascii=False)
+    return True
+
+def partition_path(election_id):
+    return history_dir / f"{election_id}.csv"
+
+def load_partition(election_id):
+    """Indexes for one election, reloaded only when the partition file changes"""
+    path = partition_path(election_id)
+    stat = path.stat() if path.exists() else None
+    signature = (stat.st_size, stat.st_mtime_ns) if stat else None
+    cached = _partitions.get(path)
+    if cached and cached['signature'] == signature:
+        return cached
+
+    records = {}
+    if stat:
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            for row in csv.DictReader(f):
+                key = (row['entity'], row['level'], row['metric'])
+                if row['value'] == '':
+                    records.pop(key, None)
+                else:
+                    records[key] = float(row['value'])
+    by_metric = {}
+    for (entity, level, metric), value in records.items():
+        by_metric.setdefault((level, metric), {})[entity] = value
+
+    partition = {'signature': signature, 'records': records, 'by_metric': by_metric}
+    _partitions[path] = partition
+    return partition
+
+def measure_of(metric):
+    """'org_panchayat_30.votes' -> 'votes'"""
+    return metric.rsplit('.', 1)[-1]
+
+def parse_value(raw, measure):
+    """Parse '1,448', '24.77%', '-' or '' into a float (None when missing).
+    Raises ValueError for text that is not a number, and for a count that is not a whole number"""
+    if raw is None:
+        return None
+    text = str(raw).replace(',', '').strip()
+    if not text or text in ('-', 'N/A', 'NA'):
+        return None
+    value = float(text[:-1] if text.endswith('%') else text)
+    if measure in COUNT_MEASURES and (text.endswith('%') or not value.is_integer()):
+        raise ValueError(f"{measure} must be a whole number, got {raw!r}")
+    return value
+
+def changed_records(election_id, records):
+    """The records whose value differs from the current one in the store"""
+    current = load_partition(election_id)['records']
+    return [record for record in records if current.get((record['entity'], record['level'], record['metric'])) != record['value']]
+
+def append_records(election_id, records):
+    """Append (entity, level, metric, value) records whose value differs from the current one;
+    a value of None withdraws the current figure"""
+    if election_id not in {election['id'] for election in load_catalog()}:
+        raise ValueError(f"unknown election {election_id}; register it first")
+    for record in records:
+        if record['value'] is not None and measure_of(record['metric']) in COUNT_MEASURES and not float(record['value']).is_integer():
+            raise ValueError(f"{election_id}: {record['entity']} {record['metric']} must be a whole number, got {record['value']}")
+    new_records = changed_records(election_id, records)
+    if not new_records:
+        return 0
+    path = partition_path(election_id)
+    write_header = not path.exists()
+    with open(path, 'a', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=RECORD_FIELDS)
+        if write_header:
+            writer.writeheader()
+        for record in new_records:
+            writer.writerow({**record, 'value': '' if record['value'] is None else repr(record['value'])})
+    return len(new_records)
+
+def get_value(election_id, entity, metric, level='org_district'):
+    return load_partition(election_id)['records'].get((entity, level, metric))
+
+def get_metric(election_id, metric, level='org_district'):
+    """{entity: value} for one metric of one election"""
+    return load_partition(election_id)['by_metric'].get((level, metric), {})
+
+def get_series(entity, metric, level='org_district', elections=None):
+    """{election id: value} across elections, in catalog order"""
+    election_ids = elections or [election['id'] for election in load_catalog()]
+    series = {}
+    for election_id in election_ids:
+        value = get_value(election_id, entity, metric, level)
+        if value is not None:
+            series[election_id] = value
+    return series
+
+def compare(election_a, election_b, metric, level='org_district', metric_b=None):
+    """{entity: {a, b, change}} for entities present in both elections"""
+    values_a = get_metric(election_a, metric, level)
+    values_b = get_metric(election_b, metric_b or metric, level)
+    return {
+        entity: {'a': values_a[entity], 'b': values_b[entity], 'change': values_b[entity] - values_a[entity]}
+        for entity in values_a.keys() & values_b.keys()
+    }
+
+def sheet_records(all_csv_rows, result_rows):
+    """(long-format records per election, rejected values) from the wide sheets, including Grand Total rows"""
+    records = {election['id']: [] for election in SHEET_ELECTIONS}
+    rejected = []
+
+    def add(election_id, entity, metric, raw):
+        try:
+            value = parse_value(raw, measure_of(metric))
+        except ValueError as e:
+            rejected.append(f"{election_id} {entity} {metric}: {e}")
+            return
+        if value is not None:
+            level = 'state' if entity == 'Grand Total' else 'org_district'
+            records[election_id].append({
+                'entity': STATE_ENTITY if level == 'state' else entity,
+                'level': level,
+                'metric': metric,
+                'value': value
+            })
+
+    for sheet_key, rows in all_csv_rows.items():
+        for row in rows:
+            entity = (row.get('Org District') or '').strip()
+            if not entity:
+                continue
+            for column, (election_id, measure) in SHEET_COLUMNS.items():
+                if column in row:
+                    add(election_id, entity, f"{sheet_key}.{measure}", row[column])
+    for row in result_rows:
+        entity = (row.get('Org District') or '').strip()
+        if entity:
+            for column, measure in RESULT_COLUMNS.items():
+                add('lsg-2025', entity, f"local_bodies.{measure}", row.get(column))
+    return records, rejected
+
+def withdrawals(election_id, records, sheet_keys):
+    """Records withdrawing the sheet figures of an election that the sheets no longer carry"""
+    fresh = {(record['entity'], record['level'], record['metric']) for record in records}
+    prefixes = tuple(f"{key}." for key in list(sheet_keys) + ['local_bodies'])
+    return [
+        {'entity': entity, 'level': level, 'metric': metric, 'value': None}
+        for (entity, level, metric) in load_partition(election_id)['records']
+        if metric.startswith(prefixes) and (entity, level, metric) not in fresh
+    ]
+
+def read_sheets(csv_dir, csv_files, result_csv_file):
+    """({sheet key: rows}, Result.csv rows)"""
+    all_csv_rows = {}
+    for sheet_key, filename in csv_files.items():
+        if (csv_dir / filename).exists():
+            with open(csv_dir / filename, 'r', encoding='utf-8') as f:
+                all_csv_rows[sheet_key] = list(csv.DictReader(f))
+    with open(csv_dir / result_csv_file, 'r', encoding='utf-8') as f:
+        result_rows = list(csv.DictReader(f))
+    return all_csv_rows, result_rows
+
+def pending_records(csv_dir, csv_files, result_csv_file):
+    """({election id: records import_sheets would append}, rejected values); writes nothing"""
+    all_csv_rows, result_rows = read_sheets(csv_dir, csv_files, result_csv_file)
+    records, rejected = sheet_records(all_csv_rows, result_rows)
+    pending = {
+        election_id: changed_records(election_id, election_records + withdrawals(election_id, election_records, all_csv_rows))
+        for election_id, election_records in records.items()
+    }
+    return pending, rejected
+
+def import_sheets(csv_dir, csv_files, result_csv_file, verbose=True):
+    """Bring the store in line with the current result sheets, appending only changed values.
+    Returns the number of records appended; rejected values are always reported"""
+    pending, rejected = pending_records(csv_dir, csv_files, result_csv_file)
+    for message in rejected:
+        print(f"  ✗ Not stored, {message}")
+    for election in SHEET_ELECTIONS:
+        register_election(election)
+    total = 0
+    for election_id, records in pending.items():
+        appended = append_records(election_id, records)
+        total += appended
+        if verbose:
+            print(f"  ✓ {election_id}: {appended} new records")
+    return total
+
+def read_long_csv(path):
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        return [
+            {'entity': row['entity'], 'level': row.get('level') or 'org_district',
+             'metric': row['metric'], 'value': parse_value(row['value'], measure_of(row['metric']))}
+            for row in csv.DictReader(f)
+        ]
+
+def main():
+    parser = argparse.ArgumentParser(description="Append-only multi-election history store")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    commands.add_parser('import-sheets', help="append the 2020/2024/2025 figures from the result sheets")
+    commands.add_parser('list', help="list registered elections")
+
+    append_parser = commands.add_parser('append', help="register an election and append long-format records")
+    append_parser.add_argument('file', help="CSV with entity,level,metric,value columns")
+    append_parser.add_argument('--election', required=True)
+    append_parser.add_argument('--name', required=True)
+    append_parser.add_argument('--kind', required=True, help="e.g. local_body, by_election, assembly, lok_sabha")
+    append_parser.add_argument('--year', type=int, required=True)
+
+    compare_parser = commands.add_parser('compare', help="compare one metric between two elections")
+    compare_parser.add_argument('election_a')
+    compare_parser.add_argument('election_b')
+    compare_parser.add_argument('metric')
+    compare_parser.add_argument('--metric-b', help="metric name in the second election, if it differs")
+    compare_parser.add_argument('--level', default='org_district')
+
+    args = parser.parse_args()
+    if args.command == 'import-sheets':
+        from result_sheets import csv_dir, csv_files, result_csv_file
+        import_sheets(csv_dir, csv_files, result_csv_file)
+    elif args.command == 'list':
+        for election in load_catalog():
+            partition = load_partition(election['id'])
+            print(f"{election['id']:<12} {election['year']}  {election['kind']:<12} {len(partition['records']):>6} records  {election['name']}")
+    elif args.command == 'append':
+        register_election({'id': args.election, 'name': args.name, 'kind': args.kind, 'year': args.year})
+        appended = append_records(args.election, read_long_csv(args.file))
+        print(f"✓ {args.election}: {appended} new records")
+    elif args.command == 'compare':
+        rows = compare(args.election_a, args.election_b, args.metric, args.level, args.metric_b)
+        for entity, values in sorted(rows.items(), key=lambda item: item[1]['change'], reverse=True):
+            print(f"{entity:<28} {values['a']:>12g} {values['b']:>12g} {values['change']:>+12.2f}")
+
+if __name__ == '__main__':
+    main()
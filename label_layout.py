@@ -0,0 +1,78 @@
+"""
+District label layout, resolved at build time.
+
+For every zoom level in LABEL_ZOOMS each label's text box is projected to
+Web Mercator pixels and placed greedily in priority order (larger districts
+first). A label whose box overlaps an already placed one is hidden at that
+zoom. The page gets one small table and paints the visible labels for the
+current zoom on a single canvas, so zooming no longer restyles any DOM nodes:
+
+    {'zooms': [5, ..., 13], 'font_sizes': [px per zoom],
+     'labels': [{'name', 'lines', 'position': [lng, lat], 'priority', 'visible': zoom bitmask}]}
+
+Text widths are estimated from the font size (bold sans-serif averages about
+0.62 em per character), which is close enough to keep labels apart.
+"""
+import math
+
+from shapely.geometry import shape
+
+LABEL_ZOOMS = list(range(5, 14))
+CHAR_WIDTH_EM = 0.62
+LETTER_SPACING = 0.3
+LINE_HEIGHT = 1.2
+# Halo around the text, kept clear of other labels (px)
+LABEL_PADDING = 3
+
+def font_size(zoom):
+    """Same steps the DOM labels used"""
+    return 10 if zoom >= 8 else 8 if zoom >= 7 else 7
+
+def label_lines(name):
+    """First space becomes a line break, as in the old marker HTML"""
+    return name.split(' ', 1)
+
+def project(lng, lat, zoom):
+    scale = 256 * 2 ** zoom
+    x = (lng + 180) / 360 * scale
+    sin = math.sin(math.radians(lat))
+    y = (0.5 - math.log((1 + sin) / (1 - sin)) / (4 * math.pi)) * scale
+    return x, y
+
+def label_box(lines, position, zoom):
+    size = font_size(zoom)
+    width = max(len(line) for line in lines) * (size * CHAR_WIDTH_EM + LETTER_SPACING) + 2 * LABEL_PADDING
+    height = len(lines) * size * LINE_HEIGHT + 2 * LABEL_PADDING
+    x, y = project(position[0], position[1], zoom)
+    return (x - width / 2, y - height / 2, x + width / 2, y + height / 2)
+
+def overlaps(a, b):
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+def district_area(geojson):
+    return sum(shape(feature['geometry']).area for feature in geojson.get('features', []) if feature.get('geometry'))
+
+def layout_labels(all_districts_data, zooms=LABEL_ZOOMS):
+    """Label table for the page (see module docstring)"""
+    candidates = [record for record in all_districts_data if record.get('centroid')]
+    candidates.sort(key=lambda record: (-district_area(record['geojson']), record['name']))
+    labels = [
+        {'name': record['name'], 'lines': label_lines(record['name']), 'position': record['centroid'],
+         'priority': priority, 'visible': 0}
+        for priority, record in enumerate(candidates)
+    ]
+    for z, zoom in enumerate(zooms):
+        placed = []
+        for label in labels:
+            box = label_box(label['lines'], label['position'], zoom)
+            if not any(overlaps(box, other) for other in placed):
+                placed.append(box)
+                label['visible'] |= 1 << z
+    return {'zooms': list(zooms), 'font_sizes': [font_size(zoom) for zoom in zooms], 'labels': labels}
+
+def hidden_counts(layout):
+    """{zoom: labels hidden by collisions}"""
+    return {
+        zoom: sum(1 for label in layout['labels'] if not label['visible'] >> z & 1)
+        for z, zoom in enumerate(layout['zooms'])
+    }
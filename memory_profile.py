@@ -0,0 +1,229 @@
+"""
+Memory profiling for generate_kerala_map_final.py --profile-memory.
+
+The build calls sample(district) after each district and mark(stage) after
+each stage. A sample is cheap: it reads the traced current and peak memory
+and RSS, then resets the peak. A mark also takes a tracemalloc snapshot and
+compares it with the previous one, giving the allocation sites whose memory
+was allocated during the stage and is still live at its end. Current RSS is
+read from /proc/self/statm on Linux, and peak RSS from getrusage.
+
+The build prints a per-stage table and the top allocation sites, and writes
+memory_profile.json. When an earlier report of the same build exists, each
+stage's and district's traced peak is compared with it, so a regression
+shows up in review:
+
+    python generate_kerala_map_final.py --force --profile-memory
+
+Tracing is expensive: every allocation is recorded, and each per-stage
+snapshot costs time that grows with the number of live allocations. The
+slowdown depends on the machine and the data, so it is not quoted here; the
+report records the time spent in snapshots, and the build's own wall time is
+printed next to it. Timings from a profiled build are not comparable with
+benchmark_pipeline.py.
+"""
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+report_path = Path(__file__).parent / "memory_profile.json"
+
+TOP_SITES = 10
+# Frames kept per allocation: shallow, since every traced frame slows the build further.
+# Sites are grouped by this traceback, so one is shown with its caller when the
+# allocating frame is inside a library (json, shapely, csv)
+FRAMES = 2
+SITES_PER_STAGE = 5
+# A stage or district whose traced peak grows by more than this (and by at least
+# REGRESSION_BYTES) against the previous report of the same build is flagged
+REGRESSION_RATIO = 1.10
+REGRESSION_BYTES = 1024 * 1024
+MB = 1024 * 1024
+# The profiler's own bookkeeping is not part of the build
+IGNORED_FILES = [__file__, tracemalloc.__file__]
+
+def rss_bytes():
+    """Current resident set size, or None where /proc is not available"""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def peak_rss_bytes():
+    """Peak resident set size of the process so far (ru_maxrss is KB on Linux, bytes on macOS)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+def rss_reading():
+    """(current, peak) RSS; ru_maxrss is sampled by the kernel and can trail the current reading"""
+    rss = rss_bytes()
+    return rss, max(filter(None, [rss, peak_rss_bytes()]), default=None)
+
+def frame_label(frame):
+    path = Path(frame.filename)
+    name = path.name if path.parent == Path(__file__).parent else f"{path.parent.name}/{path.name}"
+    return f"{name}:{frame.lineno}"
+
+def site_label(traceback):
+    """Allocating frame, preceded by its caller when that is a different file"""
+    frames = list(traceback)
+    label = frame_label(frames[-1])
+    if len(frames) > 1 and frames[-2].filename != frames[-1].filename:
+        label = f"{frame_label(frames[-2])} ({label})"
+    return label
+
+def live_sites():
+    """{traceback: (size, count)} of the live allocations, grouped with Snapshot.statistics.
+    The profiler's own allocations are dropped from the few thousand groups here:
+    Snapshot.filter_traces does the same per trace and took seconds at every mark"""
+    return {
+        stat.traceback: (stat.size, stat.count)
+        for stat in tracemalloc.take_snapshot().statistics('traceback')
+        if not any(frame.filename in IGNORED_FILES for frame in stat.traceback)
+    }
+
+class MemoryProfiler:
+    """Per-stage tracemalloc / RSS records; every method is a no-op when disabled"""
+
+    def __init__(self, enabled=False, frames=FRAMES):
+        self.enabled = enabled
+        self.stages = []
+        self.districts = []
+        self.sites = {}
+        if not enabled:
+            return
+        tracemalloc.start(frames)
+        self.frames = frames
+        # Highest traced peak since the last mark; samples reset tracemalloc's own
+        self.stage_peak = 0
+        # Wall time spent taking and comparing snapshots, the profiler's main cost
+        self.snapshot_seconds = 0.0
+        start = time.perf_counter()
+        self.live = live_sites()
+        self.snapshot_seconds += time.perf_counter() - start
+
+    def sample(self, district):
+        """Traced peak and RSS since the previous sample (no snapshot)"""
+        if not self.enabled:
+            return
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        self.stage_peak = max(self.stage_peak, peak)
+        rss, peak_rss = rss_reading()
+        self.districts.append({'district': district, 'traced_current': current, 'traced_peak': peak,
+                               'rss': rss, 'peak_rss': peak_rss})
+
+    def mark(self, stage):
+        if not self.enabled:
+            return
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        start = time.perf_counter()
+        live = live_sites()
+        grown = []
+        for traceback, (size, count) in live.items():
+            before = self.live.get(traceback, (0, 0))
+            if size > before[0]:
+                grown.append((site_label(traceback), size - before[0], count - before[1]))
+        grown.sort(key=lambda item: -item[1])
+        self.snapshot_seconds += time.perf_counter() - start
+        for site, size, _ in grown:
+            self.sites[site] = self.sites.get(site, 0) + size
+        rss, peak_rss = rss_reading()
+        self.stages.append({
+            'stage': stage,
+            'traced_current': current,
+            'traced_peak': max(peak, self.stage_peak),
+            'traced_delta': current - (self.stages[-1]['traced_current'] if self.stages else 0),
+            'rss': rss,
+            'peak_rss': peak_rss,
+            'top_sites': [{'site': site, 'size_diff': size, 'count_diff': count} for site, size, count in grown[:SITES_PER_STAGE]]
+        })
+        self.stage_peak = 0
+        self.live = live
+
+    def report(self, build):
+        return {
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'build': build,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'tracemalloc_frames': self.frames,
+            'snapshot_seconds': round(self.snapshot_seconds, 3),
+            'traced_peak': max((entry['traced_peak'] for entry in self.stages), default=0),
+            'peak_rss': max(filter(None, [entry['peak_rss'] for entry in self.stages] + [peak_rss_bytes()]), default=None),
+            'stages': self.stages,
+            'districts': self.districts,
+            'top_sites': [
+                {'site': site, 'size_diff': size}
+                for site, size in sorted(self.sites.items(), key=lambda item: -item[1])[:TOP_SITES]
+            ]
+        }
+
+    def finish(self, build, path=report_path):
+        """Print the tables, write the report and stop tracing. build describes the run (flags,
+        districts rebuilt); only a previous report of the same build is compared against"""
+        if not self.enabled:
+            return
+        tracemalloc.stop()
+        report = self.report(build)
+        previous = load_report(path)
+        if previous and previous.get('build') != build:
+            print(f"\n✗ {path.name} is from a different build ({previous.get('build')}), not comparing")
+            previous = None
+        print_report(report, previous)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+            f.write('\n')
+        print(f"✅ Memory profile written to {path}")
+
+def load_report(path=report_path):
+    if not Path(path).exists():
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def megabytes(value):
+    return f"{value / MB:.1f}" if value is not None else '-'
+
+def change(entry, old):
+    if not old or old['traced_peak'] <= 0:
+        return ''
+    ratio = entry['traced_peak'] / old['traced_peak']
+    grown = ratio > REGRESSION_RATIO and entry['traced_peak'] - old['traced_peak'] >= REGRESSION_BYTES
+    return f"{(ratio - 1) * 100:+.1f}%" + ('  ✗ more memory' if grown else '')
+
+def print_table(title, label, entries, key, previous):
+    before = {entry[key]: entry for entry in previous}
+    print(f"\n{title}")
+    print(f"  {label:<24} {'delta':>8} {'peak':>8} {'rss':>8} {'peak rss':>9}  vs previous")
+    for entry in entries:
+        delta = megabytes(entry['traced_delta']) if 'traced_delta' in entry else ''
+        print(f"  {entry[key][:24]:<24} {delta:>8} {megabytes(entry['traced_peak']):>8} {megabytes(entry['rss']):>8} "
+              f"{megabytes(entry['peak_rss']):>9}  {change(entry, before.get(entry[key]))}")
+
+def print_report(report, previous=None):
+    previous = previous or {}
+    print_table("Memory by stage (MB; traced = Python allocations seen by tracemalloc)", 'stage',
+                report['stages'], 'stage', previous.get('stages', []))
+    if report['districts']:
+        print_table("Memory by district (MB; peak while building or loading it)", 'district',
+                    report['districts'], 'district', previous.get('districts', []))
+    print(f"\n✓ Traced peak {megabytes(report['traced_peak'])} MB, peak RSS {megabytes(report['peak_rss'])} MB")
+    print(f"! {report['snapshot_seconds']:.1f} s went to tracemalloc snapshots; profiled timings are inflated")
+    print(f"\nTop allocation sites (allocated in a stage and still live at its end, summed over stages)")
+    for site in report['top_sites']:
+        print(f"  {megabytes(site['size_diff']):>8} MB  {site['site']}")
@@ -0,0 +1,91 @@
+"""
+Modal view-models: every string the district modal shows, formatted at build time.
+
+The page keeps one fixed modal skeleton (templates/final/modal_body.html).
+Opening the modal only copies a district's view-model into it:
+
+    text   {field: display string}            -> textContent of [data-text="field"]
+    width  {field: CSS width}                 -> style.width of [data-width="field"]
+    tone   {field: 'up' | 'down' | 'flat' | ''} -> class of [data-tone="field"]
+
+Values are taken from the 'combined' analytics category (panchayat +
+municipality + corporation) after the same rounding the page payload used,
+so the modal reads exactly as before. The vote-share trend has one row per
+year in analytics_result['years']; the page adds the rows from TREND_YEARS.
+"""
+import json
+
+import analytics
+
+MODAL_CATEGORY = 'combined'
+
+def metric_value(analytics_result, metric, category_index, district_index):
+    """Payload-rounded value, or None when missing"""
+    values = analytics_result['metrics'][metric][category_index]
+    return analytics.to_compact_array(values[district_index:district_index + 1], analytics.metric_digits(metric))[0]
+
+def grouped(value):
+    return f"{int(value):,}"
+
+def votes_text(value):
+    return f"{grouped(value)} votes" if value else "- votes"
+
+def change_indicator(diff):
+    """(text, tone) for a vote-share swing"""
+    if diff is None:
+        return '', ''
+    if diff > 0:
+        return f"↑ +{diff:.2f}%", 'up'
+    if diff < 0:
+        return f"↓ {diff:.2f}%", 'down'
+    return "→ 0%", 'flat'
+
+def build_view_model(record, analytics_result, category_index, district_index):
+    def metric(name):
+        if district_index is None:
+            return None
+        return metric_value(analytics_result, name, category_index, district_index)
+
+    def count(name):
+        return int(metric(name) or 0)
+
+    current, previous = analytics_result['current_year'], analytics_result['previous_year']
+    ward_change = count(f'wards_{current}') - (count(f'wards_{previous}') if previous else 0)
+    text = {
+        'title': f"{record['name']} - Election Results {current}",
+        'lb_won': str(int(record.get('localBodyWon') or 0)),
+        'lb_target': str(int(record.get('targetLocalBody') or 0)),
+        'lb_total': str(int(record.get('totalLocalBody') or 0)),
+        'lb_2020': str(int(record.get('lb2020Won') or 0)),
+        'ward_won': str(count(f'wards_{current}')),
+        'ward_change': f"{'↑' if ward_change >= 0 else '↓'} {abs(ward_change)} vs {previous}" if previous else '',
+        'ward_target': str(count('target_wards')),
+        'ward_total': grouped(count('total_wards')),
+        'ward_2020': str(count(f'wards_{previous}')) if previous else '0',
+        'lb_2nd_no_tie': str(int(record.get('localBody2ndNoTie') or 0)),
+        'lb_2nd_with_tie': str(int(record.get('localBody2ndWithTie') or 0))
+    }
+    width, tone = {}, {}
+    years = analytics_result['years']
+    for i, year in enumerate(years):
+        share = metric(f'share_{year}') or 0
+        text[f'share_{year}'] = f"{share:.2f}%"
+        text[f'votes_{year}'] = votes_text(metric(f'votes_{year}') or 0)
+        width[f'bar_{year}'] = f"{round(min(share * 2, 100), 4):g}%"
+        # Swing against the year before; none on the first row
+        swing = metric(f'swing_{year}_{years[i - 1]}') if i else None
+        text[f'swing_{year}'], tone[f'swing_{year}'] = change_indicator(swing)
+    return {'text': text, 'width': width, 'tone': tone}
+
+def build_view_models(all_districts_data, analytics_result):
+    """{district name: view-model}"""
+    category_index = analytics_result['categories'].index(MODAL_CATEGORY)
+    district_index = {name: i for i, name in enumerate(analytics_result['districts'])}
+    return {
+        record['name']: build_view_model(record, analytics_result, category_index, district_index.get(record['name']))
+        for record in all_districts_data
+    }
+
+def trend_years(analytics_result):
+    """TREND_YEARS for the page templates"""
+    return json.dumps(analytics_result['years'], separators=(',', ':'))
@@ -0,0 +1,126 @@
+"""
+Page templates under templates/, compiled once per run and rendered with a data context.
+
+Two tags are understood, and nothing else in a template is interpreted, so the
+CSS and JS stay plain files:
+
+    {% include "final/styles.css" %}   inlined at compile time (a newline right after the tag is dropped)
+    {{ districts_data }}               replaced by context['districts_data'] at render time
+
+A compiled template is a flat list of literal chunks and slot names; it is
+reused for every render until one of the files it was built from changes.
+With minify=True the flattened template is passed through asset_minify once at
+compile time (slots are protected by sentinels), so rendering costs nothing extra.
+"""
+import re
+from pathlib import Path
+
+import asset_minify
+
+templates_dir = Path(__file__).parent / "templates"
+
+TAG = re.compile(r'\{%\s*include\s+"([^"]+)"\s*%\}\n?|\{\{\s*([a-z_][a-z0-9_]*)\s*\}\}')
+
+SENTINEL = '__template_slot_{}__'
+SENTINEL_PATTERN = re.compile(r'__template_slot_(\d+)__')
+
+# Template suffix -> minifier for the whole flattened template
+MINIFIERS = {
+    '.html': asset_minify.minify_html,
+    '.js': asset_minify.minify_js,
+    '.css': asset_minify.minify_css
+}
+
+_compiled = {}
+
+def template_files():
+    return sorted(path for path in templates_dir.rglob('*') if path.is_file())
+
+def source(name):
+    with open(templates_dir / name, 'r', encoding='utf-8') as f:
+        return f.read()
+
+def parse(name, parts, files, stack=()):
+    if name in stack:
+        raise ValueError(f"template include cycle: {' -> '.join(stack + (name,))}")
+    files.append(templates_dir / name)
+    text = source(name)
+    position = 0
+    for match in TAG.finditer(text):
+        parts.append(('text', text[position:match.start()]))
+        include, slot = match.groups()
+        if include:
+            parse(include, parts, files, stack + (name,))
+        else:
+            parts.append(('slot', slot))
+        position = match.end()
+    parts.append(('text', text[position:]))
+
+def signature(files):
+    return tuple((str(path), path.stat().st_mtime_ns) for path in files)
+
+def flatten(parts):
+    """Adjacent literals merged into one chunk"""
+    chunks = []
+    for kind, value in parts:
+        if kind == 'text' and chunks and chunks[-1][0] == 'text':
+            chunks[-1] = ('text', chunks[-1][1] + value)
+        elif kind == 'slot' or value:
+            chunks.append((kind, value))
+    return chunks
+
+def minify_chunks(name, chunks):
+    """Minify a flattened template with every slot held in place by a numbered sentinel"""
+    slot_names = []
+    pieces = []
+    for kind, value in chunks:
+        if kind == 'slot':
+            pieces.append(SENTINEL.format(len(slot_names)))
+            slot_names.append(value)
+        else:
+            pieces.append(value)
+    text = ''.join(pieces)
+    minified = MINIFIERS[Path(name).suffix](text)
+    pieces = SENTINEL_PATTERN.split(minified)
+    if sorted(int(index) for index in pieces[1::2]) != list(range(len(slot_names))):
+        raise ValueError(f"{name}: minification moved or dropped a slot")
+    result = []
+    for i, piece in enumerate(pieces):
+        result.append(('text', piece) if i % 2 == 0 else ('slot', slot_names[int(piece)]))
+    return flatten(result), len(text.encode('utf-8')), len(minified.encode('utf-8'))
+
+def compile_template(name, minify=False):
+    """Flattened (kind, value) chunks, minified once when asked"""
+    key = (name, minify)
+    cached = _compiled.get(key)
+    if cached and signature(cached['files']) == cached['signature']:
+        return cached['chunks']
+
+    parts, files = [], []
+    parse(name, parts, files)
+    chunks = flatten(parts)
+    sizes = None
+    if minify:
+        chunks, before, after = minify_chunks(name, chunks)
+        sizes = (before, after)
+    _compiled[key] = {'chunks': chunks, 'files': files, 'signature': signature(files), 'sizes': sizes}
+    return chunks
+
+def text(name):
+    """The template with includes resolved and slots left as {{ name }}"""
+    return ''.join(value if kind == 'text' else '{{ ' + value + ' }}' for kind, value in compile_template(name))
+
+def minify_sizes(name):
+    """(bytes before, bytes after) of the last minified compile of a template"""
+    compile_template(name, minify=True)
+    return _compiled[(name, True)]['sizes']
+
+def slots(name):
+    return {value for kind, value in compile_template(name) if kind == 'slot'}
+
+def render(name, context, minify=False):
+    chunks = compile_template(name, minify)
+    missing = {value for kind, value in chunks if kind == 'slot'} - context.keys()
+    if missing:
+        raise KeyError(f"{name} needs {', '.join(sorted(missing))}")
+    return ''.join(value if kind == 'text' else context[value] for kind, value in chunks)
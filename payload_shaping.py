@@ -0,0 +1,54 @@
+"""
+Payload shaping: keep only the district fields the page script reads.
+
+District records carry everything the build knows (raw rows of all nine
+sheets, the vote-share breakdown, local-body lists, the counts). The browser
+reads the outline and the modal view-model (modal_view.py), which already
+holds every count formatted for display; labels come from label_layout.py.
+PAGE_FIELDS is the declared list of what the page reads; every other field is
+dropped from the shipped records and counted in the bytes-saved report.
+Build-time consumers (label layout, the modal-only page, the static API) still see the full records.
+"""
+import json
+
+# Fields the page script (templates/final/app.js) reads from a district record
+PAGE_FIELDS = ['name', 'geojson', 'view']
+
+def size(value):
+    return len(json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+
+def shape_record(record):
+    return {field: record[field] for field in PAGE_FIELDS if field in record}
+
+def shape_records(all_districts_data):
+    return [shape_record(record) for record in all_districts_data]
+
+def removed_field_bytes(all_districts_data):
+    """{field: bytes saved across all districts}, with per-key lines for removed dict fields"""
+    saved = {}
+    for record in all_districts_data:
+        full = size(record)
+        for field, value in record.items():
+            if field in PAGE_FIELDS:
+                continue
+            without = {key: other for key, other in record.items() if key != field}
+            saved[field] = saved.get(field, 0) + full - size(without)
+            if isinstance(value, dict):
+                for key, nested in value.items():
+                    label = f"{field}.{key}"
+                    saved[label] = saved.get(label, 0) + size({key: nested}) - 2
+    return saved
+
+def print_report(all_districts_data):
+    """Bytes saved per removed field; geometry is shipped either way and left out of the totals"""
+    records = [{key: value for key, value in record.items() if key != 'geojson'} for record in all_districts_data]
+    before = size(records)
+    after = size(shape_records(records))
+    print(f"{'Removed field':<42} {'bytes saved':>12}")
+    saved = removed_field_bytes(records)
+    for field in sorted((field for field in saved if '.' not in field), key=lambda field: -saved[field]):
+        print(f"{field:<42} {saved[field]:>12,}")
+        nested = [key for key in saved if key.startswith(field + '.')]
+        for key in sorted(nested, key=lambda key: -saved[key]):
+            print(f"  {key:<40} {saved[key]:>12,}")
+    print(f"\n✓ District records without geometry: {before:,} -> {after:,} bytes ({before - after:,} saved)")
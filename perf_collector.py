@@ -0,0 +1,150 @@
+"""
+Local collector for the map pages' real-user timing beacons.
+
+Build the pages with an endpoint, serve the collector, open the pages on the
+devices to measure, then report:
+
+    python generate_kerala_map_final.py --split --perf-endpoint http://192.168.1.20:8765/perf
+    python perf_collector.py serve --port 8765
+    python perf_collector.py report
+
+Each beacon is the JSON body the page sends with navigator.sendBeacon
+(templates/final/perf.js): {'page', 'renderer', 'connection', 'metrics': [[name, ms], ...]}.
+Beacons are appended as one JSON line each to perf_beacons.jsonl; the report
+gives count, p50 / p75 / p95 / p99 and max per metric, optionally per page,
+renderer or connection type.
+"""
+import argparse
+import json
+import math
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+beacons_path = Path(__file__).parent / "perf_beacons.jsonl"
+
+PERCENTILES = [50, 75, 95, 99]
+GROUP_FIELDS = ['page', 'renderer', 'connection']
+# Beacons are a few KB at most; anything bigger is not from the page
+MAX_BEACON_BYTES = 64 * 1024
+
+def percentile(values, p):
+    """Linear interpolation between closest ranks; values must be sorted"""
+    if not values:
+        return None
+    rank = (len(values) - 1) * p / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    return values[low] + (values[high] - values[low]) * (rank - low)
+
+def parse_beacon(body):
+    """The beacon as a dict, or None when it is not one the page would send"""
+    try:
+        beacon = json.loads(body)
+    except (ValueError, UnicodeDecodeError):
+        return None
+    if not isinstance(beacon, dict) or not isinstance(beacon.get('metrics'), list):
+        return None
+    metrics = [
+        [str(metric[0]), float(metric[1])] for metric in beacon['metrics']
+        if isinstance(metric, list) and len(metric) == 2 and isinstance(metric[1], (int, float))
+    ]
+    return {**{field: beacon.get(field) for field in GROUP_FIELDS}, 'metrics': metrics}
+
+def append_beacon(beacon, path=beacons_path):
+    record = {'received': datetime.now(timezone.utc).isoformat(timespec='seconds'), **beacon}
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+def load_beacons(path=beacons_path):
+    if not Path(path).exists():
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def aggregate(beacons, group_by=None):
+    """{(group, metric): sorted durations}"""
+    samples = {}
+    for beacon in beacons:
+        group = str(beacon.get(group_by)) if group_by else 'all'
+        for name, duration in beacon['metrics']:
+            samples.setdefault((group, name), []).append(duration)
+    return {key: sorted(values) for key, values in sorted(samples.items())}
+
+def print_report(beacons, group_by=None):
+    samples = aggregate(beacons, group_by)
+    if not samples:
+        print("✗ No beacons recorded yet")
+        return
+    print(f"{len(beacons)} beacons")
+    header = f"{'group':<20} {'metric':<22} {'count':>6}" + ''.join(f" {'p' + str(p):>9}" for p in PERCENTILES) + f" {'max':>9}"
+    print(header)
+    print('-' * len(header))
+    for (group, name), values in samples.items():
+        row = f"{group[:20]:<20} {name:<22} {len(values):>6}"
+        row += ''.join(f" {percentile(values, p):>9.1f}" for p in PERCENTILES)
+        print(row + f" {values[-1]:>9.1f}")
+    print("(milliseconds)")
+
+class BeaconHandler(BaseHTTPRequestHandler):
+    path_prefix = '/perf'
+    output = beacons_path
+
+    def send_empty(self, status):
+        self.send_response(status)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def do_OPTIONS(self):
+        self.send_empty(204)
+
+    def do_POST(self):
+        if self.path.split('?')[0] != self.path_prefix:
+            self.send_empty(404)
+            return
+        length = int(self.headers.get('Content-Length') or 0)
+        if length > MAX_BEACON_BYTES:
+            self.send_empty(413)
+            return
+        beacon = parse_beacon(self.rfile.read(length))
+        if beacon is None:
+            self.send_empty(400)
+            return
+        append_beacon(beacon, self.output)
+        self.send_empty(204)
+
+    def log_message(self, format, *args):
+        pass
+
+def serve(host, port, output):
+    BeaconHandler.output = output
+    server = ThreadingHTTPServer((host, port), BeaconHandler)
+    print(f"✓ Collecting beacons on http://{host}:{port}{BeaconHandler.path_prefix} into {output}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Collect and summarize the map pages' timing beacons")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = commands.add_parser('serve', help="accept beacons over HTTP and append them to the log")
+    serve_parser.add_argument('--host', default='0.0.0.0')
+    serve_parser.add_argument('--port', type=int, default=8765)
+    serve_parser.add_argument('--output', type=Path, default=beacons_path)
+
+    report_parser = commands.add_parser('report', help="percentiles per metric")
+    report_parser.add_argument('--input', type=Path, default=beacons_path)
+    report_parser.add_argument('--by', choices=GROUP_FIELDS, help="one table section per page, renderer or connection type")
+
+    args = parser.parse_args()
+    if args.command == 'serve':
+        serve(args.host, args.port, args.output)
+    else:
+        print_report(load_beacons(args.input), args.by)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+"""
+The result sheets and hierarchy files every build step reads, and their loaders.
+
+Shared by the build, validate_results.py, history_store.py and the
+benchmark, so none of them has to import the generator. benchmark_pipeline.py
+--data-dir points base_dir and csv_dir elsewhere; everything here reads them
+at call time.
+"""
+import csv
+from pathlib import Path
+
+base_dir = Path(__file__).parent / "kerala_lb_by_org_district"
+csv_dir = Path(__file__).parent
+
+districts = [
+    "Alappuzha North", "Alappuzha South", "Ernakulam City", "Ernakulam East", "Ernakulam North",
+    "Idukki North", "Idukki South", "Kannur North", "Kannur South", "Kasaragod",
+    "Kollam East", "Kollam West", "Kottayam East", "Kottayam West", "Kozhikode City",
+    "Kozhikode North", "Kozhikode Rural", "Malappuram Central", "Malappuram East", "Malappuram West",
+    "Palakkad East", "Palakkad West", "Pathanamthitta", "Thiruvananthapuram City", 
+    "Thiruvananthapuram North", "Thiruvananthapuram South", "Thrissur City", "Thrissur North",
+    "Thrissur South", "Wayanad"
+]
+
+def hierarchy_path(district_name):
+    return base_dir / district_name / f"{district_name}_hierarchy_with_geojson.json"
+
+csv_files = {
+    'org_panchayat_30': 'Organisational District Wise Result 2025 - 30 Org Panchayat (2).csv',
+    'corporation': 'Organisational District Wise Result 2025 - Corporation Latest (2).csv',
+    'municipality': 'Organisational District Wise Result 2025 - Municipality Latest (2).csv',
+    'od_panchayat_first_no_tie': 'Organisational District Wise Result 2025 - OD Panchayat first (No tie) (1).csv',
+    'od_panchayat_first_tie': 'Organisational District Wise Result 2025 - OD Panchayat First (Tie) (1).csv',
+    'od_panchayat_second_no_tie': 'Organisational District Wise Result 2025 -  OD Panchayat Second (No Tie) (1).csv',
+    'od_panchayat_second_tie': 'Organisational District Wise Result 2025 - OD Panchayat Second (Tie) (1).csv',
+    'municipality_2nd_no_tie': 'Organisational District Wise Result 2025 - Municipality 2nd (NO TIE) .csv',
+    'municipality_2nd_tie': 'Organisational District Wise Result 2025 - M - 2nd (Tie) (2).csv'
+}
+result_csv_file = 'Organisational District Wise Result 2025 - Result.csv'
+results_2025_csv_file = 'Results-2025 - Sheet1.csv'
+
+def load_csv_data():
+    """Load the nine org-district sheets keyed by district, then by sheet key"""
+    all_csv_data = {}
+    for key, filename in csv_files.items():
+        csv_path = csv_dir / filename
+        if csv_path.exists():
+            print(f"Loading: {filename}")
+            with open(csv_path, 'r', encoding='utf-8') as f:
+                reader = csv.DictReader(f)
+                for row in reader:
+                    org_district = row.get('Org District', '').strip()
+                    if org_district and org_district != 'Grand Total':
+                        if org_district not in all_csv_data:
+                            all_csv_data[org_district] = {}
+                        all_csv_data[org_district][key] = dict(row)
+            print(f"  ✓ Loaded data for {key}")
+        else:
+            print(f"  ✗ File not found: {filename}")
+    return all_csv_data
+
+def load_result_data():
+    """Load Result.csv to get counts for each category"""
+    result_csv_path = csv_dir / result_csv_file
+    result_data = {}
+    if result_csv_path.exists():
+        print(f"\nLoading: Result.csv")
+        with open(result_csv_path, 'r', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                org_district = row.get('Org District', '').strip()
+                if org_district and org_district != 'Grand Total':
+                    result_data[org_district] = {
+                        'gp_first_no_tie': row.get('GP First Without Tie', '0').strip() or '0',
+                        'gp_first_tie': row.get('GP First Tie', '0').strip() or '0',
+                        'gp_second_no_tie': row.get('GP Second Without Tie', '0').strip() or '0',
+                        'gp_second_tie': row.get('GP Second Tie', '0').strip() or '0',
+                        'municipality_first': row.get('Municipality First ', '0').strip() or '0',
+                        'municipality_2nd_no_tie': row.get('Municipality 2nd Without Tie', '0').strip() or '0',
+                        'municipality_2nd_tie': row.get('Municipality 2nd With Tie', '0').strip() or '0',
+                        'corporation_1st': row.get('Corporation 1st', '0').strip() or '0'
+                    }
+        print(f"  ✓ Loaded Result.csv for {len(result_data)} districts")
+    else:
+        print(f"  ✗ File not found: Result.csv")
+    return result_data
+
+def load_results_2025_data():
+    """Load Results-2025 - Sheet1.csv for Local Body data"""
+    results_2025_path = csv_dir / results_2025_csv_file
+    results_2025_data = {}
+    if results_2025_path.exists():
+        print(f"\nLoading: Results-2025 - Sheet1.csv")
+        with open(results_2025_path, 'r', encoding='utf-8') as f:
+            reader = csv.reader(f)
+            rows = list(reader)
+            # Rows 0-1 are headers, data starts from row 2
+            for row in rows[2:]:
+                if len(row) >= 16:
+                    district = row[0].strip()
+                    if district and district != 'Total':
+                        try:
+                            # Column indices based on CSV structure:
+                            # 0=District, 1=GP Total No., 4=GP 2020 Won, 5=GP 2025 Target
+                            # 6=Municipality Total No., 9=Municipality 2020 Won, 10=Municipality 2025 Target
+                            # 11=Corporation Total No., 14=Corporation 2020, 15=Corporation 2025 Target
+                            gp_total = row[1].strip() if len(row) > 1 and row[1].strip() and row[1].strip() != '-' else '0'
+                            gp_2020_won = row[4].strip() if len(row) > 4 and row[4].strip() and row[4].strip() != '-' else '0'
+                            gp_2025_target = row[5].strip() if len(row) > 5 and row[5].strip() and row[5].strip() != '-' else '0'
+                            
+                            m_total = row[6].strip() if len(row) > 6 and row[6].strip() and row[6].strip() != '-' else '0'
+                            m_2020_won = row[9].strip() if len(row) > 9 and row[9].strip() and row[9].strip() != '-' else '0'
+                            m_2025_target = row[10].strip() if len(row) > 10 and row[10].strip() and row[10].strip() != '-' else '0'
+                            
+                            c_total = row[11].strip() if len(row) > 11 and row[11].strip() and row[11].strip() != '-' else '0'
+                            c_2020 = row[14].strip() if len(row) > 14 and row[14].strip() and row[14].strip() != '-' else '0'
+                            c_2025_target = row[15].strip() if len(row) > 15 and row[15].strip() and row[15].strip() != '-' else '0'
+                            
+                            results_2025_data[district] = {
+                                'gp_total': gp_total,
+                                'gp_2020_won': gp_2020_won,
+                                'gp_2025_target': gp_2025_target,
+                                'm_total': m_total,
+                                'm_2020_won': m_2020_won,
+                                'm_2025_target': m_2025_target,
+                                'c_total': c_total,
+                                'c_2020': c_2020,
+                                'c_2025_target': c_2025_target
+                            }
+                        except (IndexError, ValueError) as e:
+                            continue
+        print(f"  ✓ Loaded Results-2025 - Sheet1.csv for {len(results_2025_data)} districts")
+    else:
+        print(f"  ✗ File not found: Results-2025 - Sheet1.csv")
+    return results_2025_data
@@ -0,0 +1,177 @@
+"""
+Roll-up engine for zone, revenue district and assembly constituency aggregates.
+
+Every local body in the hierarchy files becomes one row of a membership table
+(org district, zone, revenue district, AC, lsgi type, ward count). Org-district
+metrics from the analytics stage are apportioned to those rows by ward count
+within their category (panchayat / municipality / corporation), and each level
+is then a single bincount over the table's group index. Org districts or
+categories without any local body in the hierarchy are kept as "Unmapped" rows
+so every level still adds up to the state total.
+
+Only the state and org-district figures are exact: the sheets do not say how an
+org district's wards and votes split across zones, revenue districts and ACs,
+so those levels are ward-share estimates and are flagged as such. Local-body,
+ward and feature counts from the hierarchy are kept apart as `counts`; they add
+up exactly at every level.
+"""
+import numpy as np
+
+import analytics
+
+LEVELS = ['state', 'zone', 'district', 'ac', 'org_district']
+STATE_NAME = 'Kerala'
+UNMAPPED = 'Unmapped'
+
+# lsgi_type code -> analytics category holding its org-district metrics
+LSGI_CATEGORIES = {'G': 'org_panchayat_30', 'M': 'municipality', 'C': 'corporation'}
+
+# Levels whose sheet metrics are apportioned by ward share rather than summed from the sheets
+ESTIMATED_LEVELS = ['zone', 'district', 'ac']
+ESTIMATE_METHOD = 'ward_share'
+
+def additive_metrics(analytics_result):
+    """Ward and vote counts, for the years in the analytics result"""
+    return [metric for metric in analytics_result['base_metrics'] if analytics.is_count(metric)]
+
+def share_metrics(analytics_result):
+    """Vote share -> the votes it is weighted by"""
+    return {metric: f"votes_{metric[len('share_'):]}" for metric in analytics_result['base_metrics'] if metric.startswith('share_')}
+
+def extract_membership(org_district_name, data):
+    """One membership row per local body in a district hierarchy file"""
+    rows = []
+    for zone in data.get('zones', []):
+        for district in zone.get('districts', []):
+            for ac in district.get('assembly_constituencies', []):
+                for lsgi in ac.get('lsgi_types', []):
+                    for lb in lsgi.get('local_bodies', []):
+                        features = (lb.get('geojson') or {}).get('features') or []
+                        rows.append({
+                            'org_district': org_district_name,
+                            'zone': zone.get('zone_name', '') or UNMAPPED,
+                            'district': district.get('district_name', '') or UNMAPPED,
+                            'ac': ac.get('ac_name', '') or UNMAPPED,
+                            'lsgi_type': lsgi.get('lsgi_type', '').upper(),
+                            'code': lb.get('code', ''),
+                            'name': lb.get('name', ''),
+                            'ward_count': lb.get('ward_count', 0) or 0,
+                            'feature_count': len(features),
+                            'distinct_ward_numbers': len({(f.get('properties') or {}).get('Ward_No') for f in features})
+                        })
+    return rows
+
+def build_membership_table(memberships, analytics_result):
+    """Columnar membership table, with Unmapped rows for org-district metrics that have no local body"""
+    district_index = {name: i for i, name in enumerate(analytics_result['districts'])}
+    category_index = {category: i for i, category in enumerate(analytics_result['categories'])}
+    rows = [row for row in memberships if row['org_district'] in district_index and row['lsgi_type'] in LSGI_CATEGORIES]
+
+    mapped = {(row['org_district'], row['lsgi_type']) for row in rows if row['ward_count'] > 0}
+    for org_district in analytics_result['districts']:
+        for lsgi_type in LSGI_CATEGORIES:
+            if (org_district, lsgi_type) not in mapped:
+                rows.append({
+                    'org_district': org_district, 'zone': UNMAPPED, 'district': UNMAPPED, 'ac': UNMAPPED,
+                    'lsgi_type': lsgi_type, 'code': '', 'name': '', 'ward_count': 0, 'feature_count': 0,
+                    'unmapped': True
+                })
+
+    table = {
+        'state': np.array([STATE_NAME] * len(rows)),
+        'zone': np.array([row['zone'] for row in rows]),
+        'district': np.array([row['district'] for row in rows]),
+        'ac': np.array([row['ac'] for row in rows]),
+        'org_district': np.array([row['org_district'] for row in rows]),
+        'lsgi_type': np.array([row['lsgi_type'] for row in rows]),
+        'ward_count': np.array([row['ward_count'] for row in rows], dtype=float),
+        'feature_count': np.array([row['feature_count'] for row in rows], dtype=float),
+        'unmapped': np.array([row.get('unmapped', False) for row in rows], dtype=bool),
+        'district_idx': np.array([district_index[row['org_district']] for row in rows], dtype=int),
+        'category_idx': np.array([category_index[LSGI_CATEGORIES[row['lsgi_type']]] for row in rows], dtype=int)
+    }
+    return table
+
+def allocate_metrics(table, analytics_result):
+    """Apportion org-district metrics to membership rows by ward count within each category"""
+    n_categories = len(analytics_result['categories'])
+    group = table['district_idx'] * n_categories + table['category_idx']
+    weights = np.where(table['unmapped'], 0.0, table['ward_count'])
+    totals = np.bincount(group, weights=weights, minlength=len(analytics_result['districts']) * n_categories)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fraction = np.where(table['unmapped'], 1.0, np.where(totals[group] > 0, weights / totals[group], 0.0))
+
+    allocated = {}
+    metrics = analytics_result['metrics']
+    for metric in additive_metrics(analytics_result):
+        values = np.nan_to_num(metrics[metric][table['category_idx'], table['district_idx']])
+        allocated[metric] = values * fraction
+    for share, votes in share_metrics(analytics_result).items():
+        values = np.nan_to_num(metrics[share][table['category_idx'], table['district_idx']])
+        allocated[f'{share}_x_votes'] = values * allocated[votes]
+    return allocated
+
+def rollup_level(table, allocated, level, analytics_result):
+    """Keys, sheet metrics (sums, ratios, weighted shares) and hierarchy counts for one level"""
+    keys, inverse = np.unique(table[level], return_inverse=True)
+    n_keys = len(keys)
+
+    def total(weights):
+        return np.bincount(inverse, weights=weights, minlength=n_keys)
+
+    values = {metric: total(allocated[metric]) for metric in additive_metrics(analytics_result)}
+    won = values[f"wards_{analytics_result['current_year']}"]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for share, votes in share_metrics(analytics_result).items():
+            values[share] = np.where(values[votes] > 0, total(allocated[f'{share}_x_votes']) / values[votes], np.nan)
+        values['ward_win_ratio'] = np.where(values['total_wards'] > 0, won / values['total_wards'], np.nan)
+        values['target_attainment'] = np.where(values['target_wards'] > 0, won / values['target_wards'], np.nan)
+    years = analytics_result['years']
+    for year in years[-2::-1]:
+        values[f'swing_{years[-1]}_{year}'] = values[f'share_{years[-1]}'] - values[f'share_{year}']
+
+    local_body = ~table['unmapped']
+    counts = {
+        f'local_bodies_{lsgi_type}': total((local_body & (table['lsgi_type'] == lsgi_type)).astype(float))
+        for lsgi_type in LSGI_CATEGORIES
+    }
+    counts['hierarchy_wards'] = total(table['ward_count'])
+    counts['hierarchy_features'] = total(table['feature_count'])
+    return keys.tolist(), values, counts
+
+def compute_rollups(memberships, analytics_result):
+    """Precompute every hierarchy level from one membership table"""
+    table = build_membership_table(memberships, analytics_result)
+    allocated = allocate_metrics(table, analytics_result)
+    return {level: rollup_level(table, allocated, level, analytics_result) for level in LEVELS}
+
+def metric_digits(metric):
+    if metric.startswith(('share_', 'swing_')) or metric.endswith('_ratio') or metric == 'target_attainment':
+        return 4
+    return 2
+
+def compact_metrics(metric_values):
+    return {metric: analytics.to_compact_array(values, metric_digits(metric)) for metric, values in metric_values.items()}
+
+def compact_counts(counts):
+    return {name: analytics.to_compact_array(values, 0) for name, values in counts.items()}
+
+def estimate_flags(level):
+    """How a level's sheet metrics were derived"""
+    if level in ESTIMATED_LEVELS:
+        return {'estimated': True, 'method': ESTIMATE_METHOD}
+    return {'estimated': False, 'method': 'sum'}
+
+def rollups_payload(rollups):
+    """Columnar payload: levels[level].metrics[metric][key index], levels[level].counts[count][key index]"""
+    return {
+        'levels': {
+            level: {
+                'keys': keys,
+                **estimate_flags(level),
+                'metrics': compact_metrics(metric_values),
+                'counts': compact_counts(counts)
+            }
+            for level, (keys, metric_values, counts) in rollups.items()
+        }
+    }
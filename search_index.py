@@ -0,0 +1,92 @@
+"""
+Place-name search index for the split build (data/search.<hash>.json).
+
+Entries cover the org districts, their assembly constituencies, local bodies
+(name and code) and wards (number and name). Every entry is one array:
+
+    [kind, label, detail, district index, [west, south, east, north], keys]
+
+kind is 'district' | 'ac' | 'local_body' | 'ward' and keys is the normalized
+text a query is matched against. 'grams' maps index keys to the ids of the
+entries holding them, delta-encoded (each id is stored as the gap from the
+previous one):
+
+    ' f', ' fe'     first one / two characters of a token (short prefix queries)
+    'fer', 'ero'    every trigram of a token (substring queries of 3+ characters)
+
+The page fetches the file the first time the search box is focused, so it
+costs nothing on first paint; a query intersects the posting lists of its
+grams, shortest first, and only checks the few entries left.
+"""
+import re
+
+from geometry_codec import geometry_bbox, union_bbox
+
+# Enough to zoom to a ward (about 10 m)
+BBOX_PRECISION = 4
+LSGI_TYPE_NAMES = {'G': 'Grama Panchayat', 'M': 'Municipality', 'C': 'Corporation'}
+
+TOKEN = re.compile(r'[a-z0-9]+')
+
+def tokens(text):
+    return TOKEN.findall(str(text).lower())
+
+def token_grams(token):
+    grams = {' ' + token[:1], ' ' + token[:2]}
+    grams.update(token[i:i + 3] for i in range(len(token) - 2))
+    return grams
+
+def features_bbox(features):
+    return union_bbox([geometry_bbox(feature.get('geometry'), BBOX_PRECISION) for feature in features])
+
+def district_entries(name, district_index, record, layers):
+    """Search entries for one org district (layers: drilldown.build_layers() result)"""
+    entries = [('district', name, 'Org district', district_index, features_bbox(record['geojson'].get('features', [])), name)]
+    local_bodies = {}
+    ac_boxes = {}
+    for feature in layers['local_bodies']['features']:
+        lb = feature['properties']
+        bbox = geometry_bbox(feature['geometry'], BBOX_PRECISION)
+        local_bodies[lb['code']] = lb
+        if lb['ac']:
+            ac_boxes.setdefault(lb['ac'], []).append(bbox)
+        detail = ' · '.join(part for part in [LSGI_TYPE_NAMES.get(lb['lsgi_type'], ''), f"AC {lb['ac']}" if lb['ac'] else ''] if part)
+        entries.append(('local_body', lb['name'], detail, district_index, bbox, f"{lb['name']} {lb['code']}"))
+    for ac, boxes in sorted(ac_boxes.items()):
+        entries.append(('ac', ac, 'Assembly constituency', district_index, union_bbox(boxes), ac))
+    for feature in layers['wards']['features']:
+        ward = feature['properties']
+        lb = local_bodies.get(ward['code'], {})
+        label = f"Ward {ward['ward_no']}: {ward['ward_name']}" if ward['ward_name'] else f"Ward {ward['ward_no']}"
+        detail = ' '.join(part for part in [lb.get('name', ''), LSGI_TYPE_NAMES.get(lb.get('lsgi_type'), '')] if part)
+        entries.append(('ward', label, detail, district_index, geometry_bbox(feature['geometry'], BBOX_PRECISION),
+                        f"ward {ward['ward_no']} {ward['ward_name']} {lb.get('name', '')}"))
+    return entries
+
+def delta_encode(ids):
+    previous = 0
+    gaps = []
+    for entry_id in ids:
+        gaps.append(entry_id - previous)
+        previous = entry_id
+    return gaps
+
+def build_search_index(all_districts_data, drilldown_layers):
+    """Index over every district with drilldown layers (see module docstring)"""
+    records = [record for record in all_districts_data if record['name'] in drilldown_layers]
+    entries = []
+    for district_index, record in enumerate(records):
+        for kind, label, detail, index, bbox, keys in district_entries(record['name'], district_index, record,
+                                                                       drilldown_layers[record['name']]):
+            if bbox:
+                entries.append([kind, label, detail, index, bbox, ' '.join(tokens(keys))])
+    postings = {}
+    for entry_id, entry in enumerate(entries):
+        for token in set(entry[5].split()):
+            for gram in token_grams(token):
+                postings.setdefault(gram, set()).add(entry_id)
+    return {
+        'districts': [record['name'] for record in records],
+        'entries': entries,
+        'grams': {gram: delta_encode(sorted(ids)) for gram, ids in sorted(postings.items())}
+    }
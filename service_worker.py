@@ -0,0 +1,44 @@
+"""
+Service worker for the split build (dist/sw.js), so repeat visits load from
+cache and the map keeps working offline.
+
+    install    precache the shell, every assets/ file, overview.json and the CDN
+               files the shell loads (Leaflet)
+    fetch      precached files cache-first; data/ and api/ files
+               stale-while-revalidate in a cache named after the build;
+               the shell network-first, from the cache only when offline
+    activate   delete the caches of every older build
+
+BUILD_VERSION is a hash of the shell, which names every content-hashed asset
+and the overview file (which in turn names every district file), so any change
+to the page or its data produces a different sw.js and the browser installs it.
+Fetching the shell from the network first means a reload after a deploy shows
+the new build. The new worker waits until tabs running the old build are
+closed, so those keep their cached files until then.
+"""
+import json
+import re
+
+import build_manifest
+import page_templates
+from static_assets import HASH_LENGTH
+
+SERVICE_WORKER_PATH = 'sw.js'
+CACHE_PREFIX = 'kerala-map'
+
+# Absolute src/href URLs in the shell (the Leaflet CDN files)
+EXTERNAL_URL = re.compile(r'(?:src|href)="(https://[^"]+)"')
+
+def build_version(shell):
+    return build_manifest.hash_bytes(shell.encode('utf-8'))[:HASH_LENGTH]
+
+def precache_urls(shell, paths):
+    """Shell scope, the given dist/-relative paths and every external file the shell loads"""
+    return ['./'] + list(paths) + sorted(set(EXTERNAL_URL.findall(shell)))
+
+def render_service_worker(shell, paths, minify=True):
+    return page_templates.render('final/service_worker.js', {
+        'build_version': build_version(shell),
+        'cache_prefix': CACHE_PREFIX,
+        'precache_urls': json.dumps(precache_urls(shell, paths))
+    }, minify)
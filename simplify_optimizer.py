@@ -0,0 +1,163 @@
+"""
+Byte-budget simplification optimizer for the statewide overview outlines.
+
+Instead of one hand-tuned tolerance / precision pair for every district, each
+district is tried on a ladder of simplification tolerances and grid
+precisions. Every candidate is measured by its encoded size and by its error
+against the full outline: Hausdorff distance (worst visible deviation, in
+metres) and symmetric-difference area as a fraction of the district area.
+Candidates dominated on (bytes, Hausdorff, area error) are dropped. The
+cheapest candidate of every district is then upgraded greedily, best
+reduction of the combined error score per byte first, until the byte budget
+is spent. The score adds both errors, each divided by its largest value over
+all districts' frontiers, so neither unit outweighs the other.
+
+    python simplify_optimizer.py --budget 60000            # report from the build cache
+    python generate_kerala_map_final.py --split --overview-budget 60000
+"""
+import argparse
+import json
+import sys
+
+from shapely.geometry import shape
+from shapely.ops import unary_union
+from shapely.validation import make_valid
+
+import geometry_codec
+
+TOLERANCES = [0.0002, 0.0005, 0.001, 0.002, 0.003, 0.005, 0.008, 0.012, 0.02]
+PRECISIONS = [3, 4, 5]
+
+# Degrees -> metres (latitude; longitude differs by under 2% across Kerala)
+METRES_PER_DEGREE = 111320
+
+def collection_shape(geojson):
+    geometries = [make_valid(shape(feature['geometry'])) for feature in geojson.get('features', []) if feature.get('geometry')]
+    return unary_union(geometries) if geometries else None
+
+def simplified_collection(geojson, tolerance):
+    features = []
+    for feature in geojson.get('features', []):
+        if not feature.get('geometry'):
+            continue
+        simplified = shape(feature['geometry']).simplify(tolerance, preserve_topology=True)
+        features.append({'type': 'Feature', 'properties': feature.get('properties', {}), 'geometry': simplified.__geo_interface__})
+    return {'type': 'FeatureCollection', 'features': features}
+
+def evaluate(geojson, original, tolerance, precision):
+    """Encoded bytes plus Hausdorff / area error of one (tolerance, precision) candidate"""
+    encoded = geometry_codec.encode_geojson(simplified_collection(geojson, tolerance), precision)
+    size = len(json.dumps(encoded, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+    approximation = collection_shape(geometry_codec.decode_geojson(encoded))
+    if approximation is None or approximation.is_empty:
+        return {'tolerance': tolerance, 'precision': precision, 'bytes': size,
+                'hausdorff_m': float('inf'), 'area_error': 1.0}
+    return {
+        'tolerance': tolerance,
+        'precision': precision,
+        'bytes': size,
+        'hausdorff_m': round(original.hausdorff_distance(approximation) * METRES_PER_DEGREE, 1),
+        'area_error': round(original.symmetric_difference(approximation).area / original.area, 6) if original.area else 0.0
+    }
+
+# Objectives a candidate is compared on, all lower-is-better
+OBJECTIVES = ['bytes', 'hausdorff_m', 'area_error']
+
+def dominates(a, b):
+    """a is no worse than b on every objective and better on at least one"""
+    return all(a[key] <= b[key] for key in OBJECTIVES) and any(a[key] < b[key] for key in OBJECTIVES)
+
+def pareto_candidates(geojson):
+    """Non-dominated candidates, sorted by size"""
+    original = collection_shape(geojson)
+    if original is None or original.is_empty:
+        return []
+    candidates = sorted(
+        (evaluate(geojson, original, tolerance, precision) for tolerance in TOLERANCES for precision in PRECISIONS),
+        key=lambda c: (c['bytes'], c['hausdorff_m'], c['area_error'])
+    )
+    return [candidate for candidate in candidates if not any(dominates(other, candidate) for other in candidates)]
+
+def error_scales(frontiers):
+    """Largest finite Hausdorff distance and area error over every frontier, the score's units"""
+    candidates = [candidate for frontier in frontiers.values() for candidate in frontier]
+    hausdorff = max((c['hausdorff_m'] for c in candidates if c['hausdorff_m'] != float('inf')), default=0)
+    area = max((c['area_error'] for c in candidates), default=0)
+    return hausdorff or 1.0, area or 1.0
+
+def error_score(candidate, scales):
+    return candidate['hausdorff_m'] / scales[0] + candidate['area_error'] / scales[1]
+
+def optimize(collections, budget):
+    """{name: chosen candidate} within budget bytes, plus the Pareto frontier of every district"""
+    frontiers = {name: pareto_candidates(geojson) for name, geojson in collections.items()}
+    frontiers = {name: frontier for name, frontier in frontiers.items() if frontier}
+    choice = {name: 0 for name in frontiers}
+    total = sum(frontier[0]['bytes'] for frontier in frontiers.values())
+    scales = error_scales(frontiers)
+
+    while True:
+        best = None
+        for name, frontier in frontiers.items():
+            current = frontier[choice[name]]
+            for index in range(choice[name] + 1, len(frontier)):
+                upgrade = frontier[index]
+                extra = upgrade['bytes'] - current['bytes']
+                if total + extra > budget:
+                    break
+                gain = (error_score(current, scales) - error_score(upgrade, scales)) / max(extra, 1)
+                # A larger candidate can trade one error for the other; only take net improvements
+                if gain > 0 and (best is None or gain > best[0]):
+                    best = (gain, name, index, extra)
+        if best is None:
+            break
+        _, name, index, extra = best
+        choice[name] = index
+        total += extra
+
+    return {name: frontiers[name][index] for name, index in choice.items()}, frontiers
+
+def print_report(chosen, frontiers, budget):
+    total = sum(candidate['bytes'] for candidate in chosen.values())
+    print(f"{'District':<28} {'tol':>7} {'prec':>4} {'bytes':>8} {'hausdorff m':>12} {'area err %':>10}  candidates")
+    for name, candidate in chosen.items():
+        print(f"{name:<28} {candidate['tolerance']:>7g} {candidate['precision']:>4} {candidate['bytes']:>8} "
+              f"{candidate['hausdorff_m']:>12.1f} {candidate['area_error'] * 100:>10.3f}  {len(frontiers[name])}")
+    status = '✓' if total <= budget else '✗'
+    worst = max((candidate['hausdorff_m'] for candidate in chosen.values()), default=0)
+    print(f"\n{status} {total} of {budget} bytes, worst Hausdorff {worst:.1f} m")
+
+def report_payload(chosen, frontiers, budget):
+    return {
+        'budget': budget,
+        'bytes': sum(candidate['bytes'] for candidate in chosen.values()),
+        'districts': {name: {'chosen': chosen[name], 'frontier': frontiers[name]} for name in chosen}
+    }
+
+def main():
+    import build_manifest
+    from result_sheets import districts
+
+    parser = argparse.ArgumentParser(description="Choose per-district overview simplification for a byte budget")
+    parser.add_argument('--budget', type=int, default=60000, help="byte budget for all overview outlines (default: %(default)s)")
+    parser.add_argument('--json', metavar='PATH', help="also write the bytes-vs-error report as JSON")
+    args = parser.parse_args()
+
+    collections = {}
+    for district_name in districts:
+        record = build_manifest.load_record(district_name)
+        if record:
+            collections[district_name] = record['geojson']
+    if not collections:
+        print("✗ No cached district records; run generate_kerala_map_final.py first")
+        sys.exit(1)
+
+    chosen, frontiers = optimize(collections, args.budget)
+    print_report(chosen, frontiers, args.budget)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report_payload(chosen, frontiers, args.budget), f, indent=2, ensure_ascii=False)
+        print(f"✅ Report written: {args.json}")
+
+if __name__ == '__main__':
+    main()
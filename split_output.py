@@ -0,0 +1,99 @@
+"""
+Split build output: a small app shell plus per-district data files.
+
+    dist/index.html                       shell: modal markup and the hashed asset names
+    dist/sw.js                            service worker caching the shell, assets and data (service_worker.py)
+    dist/assets/app.<hash>.css|js         page styles, app script and loader
+    dist/assets/geometry_worker.<hash>.js fetches and decodes geometry files off the main thread
+    dist/data/overview.<hash>.json        coarse outlines and the label layout for first paint,
+                                          plus the file index for every district
+    dist/data/lod/<slug>.z<zoom>.<hash>.json  intermediate level of detail, fetched once the
+                                          district is on screen at that zoom
+    dist/data/geometry/<slug>.<hash>.json full-detail district outline, the finest level
+    dist/data/views/<slug>.<hash>.json    modal view-model (modal_view.py), fetched on click
+    dist/data/drilldown/<slug>.<hash>.json local-body and ward layers, fetched on click and
+                                          dropped again when the map is zoomed out
+    dist/data/search.<hash>.json          place-name search index (search_index.py), fetched
+                                          when the search box is first focused
+
+First paint only depends on overview.json, whose size is set by the overview
+simplification tolerance rather than by the full dataset. Each district lists
+its levels of detail as {'zoom', 'path'}; the overview outline covers every
+zoom below the first one.
+"""
+import json
+
+from shapely.geometry import shape, mapping
+
+import drilldown
+from build_manifest import slugify
+from geometry_codec import GEOMETRY_PRECISION, encode_geojson
+from static_assets import hashed_name
+
+# Coarse outlines for the statewide overview (degrees / decimal places)
+OVERVIEW_TOLERANCE = 0.005
+OVERVIEW_PRECISION = 4
+# Intermediate levels of detail: (min zoom, tolerance, precision), between the
+# overview and the merged outline (already simplified at 0.001, GEOMETRY_PRECISION
+# places); the full geometry file takes over from FULL_DETAIL_ZOOM
+LOD_LEVELS = [(8, 0.0025, 4)]
+FULL_DETAIL_ZOOM = 10
+
+def overview_geometry(geojson, tolerance=OVERVIEW_TOLERANCE, precision=OVERVIEW_PRECISION):
+    """Simplified, encoded copy of a district FeatureCollection"""
+    features = []
+    for feature in geojson.get('features', []):
+        simplified = shape(feature['geometry']).simplify(tolerance, preserve_topology=True)
+        features.append({
+            'type': 'Feature',
+            'properties': feature.get('properties', {}),
+            'geometry': mapping(simplified)
+        })
+    return encode_geojson({'type': 'FeatureCollection', 'features': features}, precision)
+
+def detail_levels(geojson, slug, precision, add):
+    """[{'zoom', 'path'}] coarsest first; a level encoding to the same bytes as the next finer one
+    (an outline already simpler than its tolerance) is skipped rather than shipped twice"""
+    levels = [(zoom, f"lod/{slug}.z{zoom}.json", dumps(overview_geometry(geojson, tolerance, lod_precision)))
+              for zoom, tolerance, lod_precision in LOD_LEVELS]
+    levels.append((FULL_DETAIL_ZOOM, f"geometry/{slug}.json", dumps(encode_geojson(geojson, precision))))
+    kept = [level for level, finer in zip(levels, levels[1:]) if level[2] != finer[2]] + levels[-1:]
+    return [{'zoom': zoom, 'path': add(path, data)} for zoom, path, data in kept]
+
+def dumps(value):
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def build_split_files(all_districts_data, precision=GEOMETRY_PRECISION, overview_settings=None, drilldown_layers=None,
+                      labels=None, search=None):
+    """({content-hashed path relative to the data directory: bytes}, overview path)
+
+    overview_settings optionally maps a district name to its (tolerance, precision) for the overview;
+    drilldown_layers maps a district name to its drilldown.build_layers() result;
+    labels is the label_layout.layout_labels() table, shipped in overview.json;
+    search is the search_index.build_search_index() result, written as search.json.
+    """
+    files = {}
+
+    def add(path, data):
+        path = hashed_name(path, data)
+        files[path] = data
+        return path
+
+    overview = {'districts': [], 'labels': labels}
+    if search:
+        overview['search'] = add('search.json', dumps(search))
+    for record in all_districts_data:
+        slug = slugify(record['name'])
+        tolerance, overview_precision = (overview_settings or {}).get(record['name'], (OVERVIEW_TOLERANCE, OVERVIEW_PRECISION))
+        entry = {
+            'name': record['name'],
+            'geojson': overview_geometry(record['geojson'], tolerance, overview_precision),
+            'lods': detail_levels(record['geojson'], slug, precision, add),
+            'view': add(f"views/{slug}.json", dumps({'name': record['name'], 'view': record['view']}))
+        }
+        layers = (drilldown_layers or {}).get(record['name'])
+        if layers:
+            entry['drilldown'] = add(f"drilldown/{slug}.json", dumps(drilldown.encode_layers(record['name'], layers, precision)))
+        overview['districts'].append(entry)
+    overview_path = add('overview.json', dumps(overview))
+    return files, overview_path
@@ -0,0 +1,115 @@
+"""
+Versioned static JSON API for downstream consumers.
+
+    dist/api/v1/index.json                            every file below with its ETag and size
+    dist/api/v1/summary.json                          state totals (sheet metrics and hierarchy counts) plus one line per org district
+    dist/api/v1/districts/<slug>.json                 all metrics of one org district
+    dist/api/v1/districts/<slug>/local-bodies.json    its local bodies (zone, AC, type, wards)
+    dist/api/v1/rankings/<metric>.json                districts ranked per category
+
+Files are deterministic: an unchanged figure keeps its ETag, so consumers can
+poll index.json and fetch only the files whose ETag moved.
+"""
+import json
+
+import analytics
+import rollups
+from build_manifest import hash_bytes, slugify
+
+API_VERSION = 'v1'
+
+# Local-body counts carried over from the district records
+RECORD_COUNTS = ['totalLocalBody', 'targetLocalBody', 'totalLocalBodiesWon', 'localBodyWon', 'lb2020Won',
+                 'localBody2ndNoTie', 'localBody2ndWithTie', 'ward2ndNoTie', 'ward2ndWithTie']
+
+MEMBERSHIP_FIELDS = ['code', 'name', 'lsgi_type', 'zone', 'district', 'ac', 'ward_count']
+
+def dumps(value):
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'), sort_keys=True).encode('utf-8')
+
+def value_at(values, index, digits):
+    return analytics.to_compact_array(values[index:index + 1], digits)[0]
+
+def district_metrics(analytics_result, category_index, district_index):
+    return {
+        metric: value_at(values[category_index], district_index, analytics.metric_digits(metric))
+        for metric, values in analytics_result['metrics'].items()
+    }
+
+def summary_metrics(analytics_result):
+    """Headline metrics (combined category) repeated in summary.json, for the years in the store"""
+    current, latest = analytics_result['current_year'], analytics_result['years'][-1]
+    return (['total_wards', f'wards_{current}', 'target_wards', f'votes_{latest}', f'share_{latest}']
+            + [f'swing_{latest}_{year}' for year in analytics_result['years'][-2::-1]] + ['target_attainment'])
+
+def build_api_files(analytics_result, all_districts_data, memberships, rollup_result):
+    """{path relative to the api directory: bytes}, including index.json"""
+    headline = summary_metrics(analytics_result)
+    records = {record['name']: record for record in all_districts_data}
+    files = {}
+    summary_districts = []
+
+    for d, name in enumerate(analytics_result['districts']):
+        slug = slugify(name)
+        record = records.get(name, {})
+        metrics = {
+            category: district_metrics(analytics_result, c, d)
+            for c, category in enumerate(analytics_result['categories'])
+        }
+        local_bodies = [
+            {field: row[field] for field in MEMBERSHIP_FIELDS}
+            for row in memberships if row['org_district'] == name
+        ]
+        files[f"districts/{slug}.json"] = dumps({
+            'name': name,
+            'slug': slug,
+            'centroid': record.get('centroid'),
+            'counts': {key: record[key] for key in RECORD_COUNTS if key in record},
+            'metrics': metrics,
+            'local_bodies': f"districts/{slug}/local-bodies.json"
+        })
+        files[f"districts/{slug}/local-bodies.json"] = dumps({'name': name, 'slug': slug, 'local_bodies': local_bodies})
+        summary_districts.append({
+            'name': name,
+            'slug': slug,
+            **{metric: metrics['combined'][metric] for metric in headline},
+            'url': f"districts/{slug}.json"
+        })
+
+    _, state_values, state_counts = rollup_result['state']
+    files['summary.json'] = dumps({
+        'version': API_VERSION,
+        'state': {
+            **rollups.estimate_flags('state'),
+            'metrics': {metric: values[0] for metric, values in rollups.compact_metrics(state_values).items()},
+            'counts': {name: values[0] for name, values in rollups.compact_counts(state_counts).items()}
+        },
+        'categories': analytics_result['categories'],
+        'districts': summary_districts
+    })
+
+    for metric in analytics_result['ranked_metrics']:
+        ranking = {}
+        for c, category in enumerate(analytics_result['categories']):
+            rows = []
+            for d, name in enumerate(analytics_result['districts']):
+                rank = analytics_result['metrics'][f'rank_{metric}'][c, d]
+                if rank == rank:  # skip NaN
+                    rows.append({
+                        'name': name,
+                        'slug': slugify(name),
+                        'value': value_at(analytics_result['metrics'][metric][c], d, analytics.metric_digits(metric)),
+                        'rank': int(rank),
+                        'percentile': value_at(analytics_result['metrics'][f'percentile_{metric}'][c], d, 2)
+                    })
+            ranking[category] = sorted(rows, key=lambda row: (row['rank'], row['name']))
+        files[f"rankings/{metric}.json"] = dumps({'metric': metric, 'categories': ranking})
+
+    files['index.json'] = dumps({
+        'version': API_VERSION,
+        'files': {
+            path: {'etag': f'"{hash_bytes(data)}"', 'bytes': len(data)}
+            for path, data in sorted(files.items())
+        }
+    })
+    return files
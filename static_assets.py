@@ -0,0 +1,109 @@
+"""
+Content-hashed, precompressed static assets for the split build.
+
+Every data, JS and CSS file under dist/ is named after its content
+(overview.3f9a1c0b2e.json), so it can be cached forever; only the small
+index.html shell is served with a short TTL and points at the current names.
+Each compressible file also gets .gz and .br siblings (brotli is optional and
+skipped when the module is not installed) for hosts that serve precompressed
+variants, and dist/vercel.json carries the matching Cache-Control headers
+(dist/sw.js, the service worker, is revalidated like the shell).
+"""
+import gzip
+import json
+from pathlib import Path
+
+import build_manifest
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+HASH_LENGTH = 10
+COMPRESSIBLE_SUFFIXES = ('.html', '.js', '.css', '.json')
+
+# Directories under dist/ whose files are always content-hashed
+HASHED_DIRS = ['data', 'assets']
+IMMUTABLE_CACHE = 'public, max-age=31536000, immutable'
+SHELL_CACHE = 'public, max-age=0, s-maxage=60, stale-while-revalidate=300'
+# Static API files keep stable names; consumers revalidate with the ETags from index.json
+API_CACHE = 'public, max-age=0, s-maxage=60, must-revalidate'
+
+def hashed_name(path, data):
+    """'geometry/wayanad.json' -> 'geometry/wayanad.<content hash>.json'"""
+    path = Path(path)
+    digest = build_manifest.hash_bytes(data)[:HASH_LENGTH]
+    return (path.parent / f"{path.stem}.{digest}{path.suffix}").as_posix()
+
+def compressed_variants(data):
+    """{suffix: bytes} for every available precompression (deterministic output)"""
+    variants = {'.gz': gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants['.br'] = brotli.compress(data, quality=11)
+    return variants
+
+def write_asset(path, data, manifest, outputs):
+    """Write a file plus its .gz/.br variants; variants are only recompressed when the source changes"""
+    written = build_manifest.write_if_changed(path, data, manifest, outputs)
+    if Path(path).suffix not in COMPRESSIBLE_SUFFIXES:
+        return written
+    source_hash = outputs[build_manifest.file_key(path)]['hash']
+    suffixes = ['.gz'] + (['.br'] if brotli is not None else [])
+    variant_paths = [Path(f"{path}{suffix}") for suffix in suffixes]
+    if all(
+        manifest['outputs'].get(build_manifest.file_key(variant), {}).get('source') == source_hash
+        and build_manifest.output_unchanged(manifest, variant)
+        for variant in variant_paths
+    ):
+        for variant in variant_paths:
+            outputs[build_manifest.file_key(variant)] = manifest['outputs'][build_manifest.file_key(variant)]
+        return written
+    for suffix, compressed in compressed_variants(data).items():
+        variant = Path(f"{path}{suffix}")
+        written += build_manifest.write_if_changed(variant, compressed, manifest, outputs)
+        outputs[build_manifest.file_key(variant)]['source'] = source_hash
+    return written
+
+def prune_outputs(outputs, directory):
+    """Delete every file under directory that this build did not write. Scanning the directory
+    rather than the previous manifest also catches files orphaned by a build in between that
+    did not write this directory (a non-split build drops dist/ from the manifest)"""
+    directory = Path(directory)
+    if not directory.exists():
+        return 0
+    removed = 0
+    for path in sorted(directory.rglob('*')):
+        if path.is_file() and build_manifest.file_key(path) not in outputs:
+            path.unlink()
+            removed += 1
+    return removed
+
+def vercel_config():
+    """Headers for deploying dist/ as the site root"""
+    return {
+        'headers': [
+            {
+                'source': f'/{directory}/(.*)',
+                'headers': [{'key': 'Cache-Control', 'value': IMMUTABLE_CACHE}]
+            }
+            for directory in HASHED_DIRS
+        ] + [
+            {
+                'source': source,
+                'headers': [{'key': 'Cache-Control', 'value': SHELL_CACHE}]
+            }
+            for source in ['/', '/index.html', '/sw.js']
+        ] + [
+            {
+                'source': '/api/(.*)',
+                'headers': [
+                    {'key': 'Cache-Control', 'value': API_CACHE},
+                    {'key': 'Access-Control-Allow-Origin', 'value': '*'}
+                ]
+            }
+        ]
+    }
+
+def vercel_json():
+    return (json.dumps(vercel_config(), indent=2) + '\n').encode('utf-8')
@@ -0,0 +1,315 @@
+"""
+Synthetic input data for scale testing the pipeline.
+
+Writes hierarchy files with the real schema (zones -> districts ->
+assembly_constituencies -> lsgi_types -> local_bodies, each local body with
+a ward FeatureCollection) plus the eleven result CSVs under the names
+generate_kerala_map_final.py reads, so a benchmark only has to point at a
+different data directory:
+
+    python synthetic_data.py --scale 10
+    python benchmark_pipeline.py --data-dir synthetic/10x
+
+--scale is a multiple of the one shipped hierarchy file (Kozhikode City,
+232 wards): 1x is one such district, 10x ten of them, 100x is spread over
+all 30 org districts (about 23k wards, roughly the statewide ward count).
+Wards are cells of a jittered grid. Neighbouring wards share their edges
+exactly, as surveyed wards do, and --vertices-per-ward sets how finely
+those edges are sampled. --missing-local-bodies and --missing-wards drop
+features on purpose, to leave the gaps merge_features_to_boundary has to
+fill. The output is deterministic for a given --seed.
+"""
+import argparse
+import csv
+import json
+import math
+import random
+from pathlib import Path
+
+import result_sheets
+
+BASE_WARDS = 232
+WARDS_PER_LOCAL_BODY = 24
+VERTICES_PER_WARD = 80
+# Ward cell size and edge / corner jitter (degrees)
+WARD_SIZE = 0.014
+EDGE_JITTER = 0.12 * WARD_SIZE
+CORNER_JITTER = 0.2 * WARD_SIZE
+LOCAL_BODIES_PER_AC = 7
+DISTRICTS_PER_ZONE = 3
+# Every fifth local body is a municipality; one corporation per district with 'City' in its name
+MUNICIPALITY_EVERY = 5
+# Districts are laid out on a grid starting here (south-west corner, degrees)
+ORIGIN = (74.9, 8.2)
+LSGI_TYPE_NAMES = {'G': 'Grama Panchayat', 'M': 'Municipality', 'C': 'Corporation'}
+
+def edge_rng(seed, *key):
+    return random.Random(':'.join(str(part) for part in (seed,) + key))
+
+class WardGrid:
+    """Jittered grid of one district: shared corners and edges, so adjacent cells tile exactly"""
+
+    def __init__(self, seed, district_index, origin, vertices_per_ward):
+        self.seed = seed
+        self.district_index = district_index
+        self.origin = origin
+        self.points_per_edge = max(1, vertices_per_ward // 4)
+
+    def corner(self, i, j):
+        rng = edge_rng(self.seed, self.district_index, 'corner', i, j)
+        return (self.origin[0] + i * WARD_SIZE + rng.uniform(-CORNER_JITTER, CORNER_JITTER),
+                self.origin[1] + j * WARD_SIZE + rng.uniform(-CORNER_JITTER, CORNER_JITTER))
+
+    def edge(self, a, b):
+        """Points from corner a up to (not including) corner b; the same points either way round"""
+        start, end = min(a, b), max(a, b)
+        p, q = self.corner(*start), self.corner(*end)
+        dx, dy = q[0] - p[0], q[1] - p[1]
+        length = math.hypot(dx, dy) or 1
+        normal = (-dy / length, dx / length)
+        rng = edge_rng(self.seed, self.district_index, 'edge', start, end)
+        points = [p]
+        for m in range(1, self.points_per_edge):
+            t = m / self.points_per_edge
+            offset = rng.uniform(-EDGE_JITTER, EDGE_JITTER) * math.sin(math.pi * t)
+            points.append((p[0] + t * dx + offset * normal[0], p[1] + t * dy + offset * normal[1]))
+        points.append(q)
+        if start != a:
+            points.reverse()
+        return points[:-1]
+
+    def cell(self, i, j):
+        corners = [(i, j), (i + 1, j), (i + 1, j + 1), (i, j + 1)]
+        ring = []
+        for a, b in zip(corners, corners[1:] + corners[:1]):
+            ring.extend(self.edge(a, b))
+        ring.append(ring[0])
+        return [[round(x, 7), round(y, 7)] for x, y in ring]
+
+def ward_counts(total_wards, local_bodies):
+    """Spread total_wards over local bodies as evenly as possible"""
+    base, extra = divmod(total_wards, local_bodies)
+    return [base + (1 if index < extra else 0) for index in range(local_bodies)]
+
+def lsgi_type_for(district_name, index):
+    if index == 0 and 'City' in district_name:
+        return 'C'
+    return 'M' if index % MUNICIPALITY_EVERY == MUNICIPALITY_EVERY - 1 else 'G'
+
+def ward_feature(grid, cell, ward_no, names, polygon_id):
+    org_district, revenue_district, local_body, lsgi_type, ac_name, ac_number = names
+    return {
+        'type': 'Feature',
+        'geometry': {'type': 'Polygon', 'coordinates': [grid.cell(*cell)]},
+        'properties': {
+            'ORIG_FID': polygon_id,
+            'Created_Da': '2024/10/17 00:00:00.000',
+            'District': revenue_district,
+            'LSGD': local_body,
+            'Lsgd_Type': LSGI_TYPE_NAMES[lsgi_type],
+            'Remarks': '',
+            'Surveyor': 'Synthetic',
+            'Ward_Name': f"{local_body.upper()} WARD {ward_no}",
+            'Ward_No': str(ward_no),
+            'Shape_Leng': '0',
+            'Shape_Area': '0',
+            'Local_Body': local_body,
+            'Org_District': org_district,
+            'AC_Name': ac_name,
+            'AC_Number': str(ac_number)
+        }
+    }
+
+def build_hierarchy(district_name, district_index, total_wards, origin, options, rng):
+    """(hierarchy dict, {lsgi type: ward count}) for one synthetic org district"""
+    counts = ward_counts(total_wards, max(1, math.ceil(total_wards / options['wards_per_local_body'])))
+    block_cols = math.ceil(math.sqrt(options['wards_per_local_body']))
+    block_rows = math.ceil(options['wards_per_local_body'] / block_cols)
+    blocks_per_row = math.ceil(math.sqrt(len(counts)))
+    grid = WardGrid(options['seed'], district_index, origin, options['vertices_per_ward'])
+    revenue_district = district_name.split()[0]
+
+    acs = {}
+    wards_by_type = {'G': 0, 'M': 0, 'C': 0}
+    polygon_id = 0
+    for index, count in enumerate(counts):
+        lsgi_type = lsgi_type_for(district_name, index)
+        ac_number = index // LOCAL_BODIES_PER_AC + 1
+        ac_name = f"{revenue_district} AC {ac_number}"
+        local_body = f"{revenue_district} {LSGI_TYPE_NAMES[lsgi_type]} {index + 1}"
+        names = (district_name, revenue_district, local_body, lsgi_type, ac_name, ac_number)
+        block_x, block_y = (index % blocks_per_row) * block_cols, (index // blocks_per_row) * block_rows
+        features = []
+        for ward in range(count):
+            polygon_id += 1
+            if rng.random() < options['missing_wards']:
+                continue
+            cell = (block_x + ward % block_cols, block_y + ward // block_cols)
+            features.append(ward_feature(grid, cell, ward + 1, names, polygon_id))
+        if rng.random() < options['missing_local_bodies']:
+            features = []
+        wards_by_type[lsgi_type] += count
+        lsgi_types = acs.setdefault(ac_name, {})
+        lsgi_types.setdefault(lsgi_type, []).append({
+            'name': local_body,
+            'code': f"{lsgi_type}{district_index + 1:02d}{index + 1:03d}",
+            'ward_count': count,
+            'geojson': {'type': 'FeatureCollection', 'name': revenue_district, 'features': features}
+        })
+
+    hierarchy = {
+        'org_district_name': district_name,
+        'zones': [{
+            'zone_name': f"Synthetic Zone {district_index // DISTRICTS_PER_ZONE + 1}",
+            'districts': [{
+                'district_name': revenue_district,
+                'assembly_constituencies': [
+                    {
+                        'ac_name': ac_name,
+                        'lsgi_types': [
+                            {'lsgi_type': lsgi_type, 'lsgi_type_name': LSGI_TYPE_NAMES[lsgi_type], 'local_bodies': local_bodies}
+                            for lsgi_type, local_bodies in lsgi_types.items()
+                        ]
+                    }
+                    for ac_name, lsgi_types in acs.items()
+                ]
+            }]
+        }]
+    }
+    extent = (blocks_per_row * block_cols, math.ceil(len(counts) / blocks_per_row) * block_rows)
+    return hierarchy, wards_by_type, extent
+
+# Result sheet columns, as in the real exports
+SHEET_COLUMNS = ['Org District', 'Total Wards 2025', 'NDA - 2025 Result Wards', 'Target Wards', 'NDA - 2020 Wards',
+                 'NDA 2025 Vote', '2025 Vote Share', '2024 Votes', '2024 Vote Share', '2020 Votes', '2020 Vote Share']
+TARGET_SHEET_COLUMNS = SHEET_COLUMNS[:7] + ['Target Vote Share'] + SHEET_COLUMNS[7:]
+FIRST_NO_TIE_COLUMNS = ['Org District', 'Panchayat First '] + TARGET_SHEET_COLUMNS[1:]
+ORG_PANCHAYAT_COLUMNS = ['Org District', 'Total Wards 2025', 'NDA - 2025 Result Wards', 'Target Wards', 'NDA - 2020 Wards',
+                         'NDA 2025 Vote', '2025 Vote Share', 'Target Vote Share', '2024 Vote Share', '2020 Vote Share',
+                         '2024 Votes', '2020 Votes']
+# Sheet key -> (columns, lsgi types whose wards it counts, share of those wards)
+SHEETS = {
+    'org_panchayat_30': (ORG_PANCHAYAT_COLUMNS, 'G', 1.0),
+    'corporation': (SHEET_COLUMNS, 'C', 1.0),
+    'municipality': (SHEET_COLUMNS, 'M', 1.0),
+    'od_panchayat_first_no_tie': (FIRST_NO_TIE_COLUMNS, 'G', 0.05),
+    'od_panchayat_first_tie': (TARGET_SHEET_COLUMNS, 'G', 0.03),
+    'od_panchayat_second_no_tie': (TARGET_SHEET_COLUMNS, 'G', 0.08),
+    'od_panchayat_second_tie': (TARGET_SHEET_COLUMNS, 'G', 0.04),
+    'municipality_2nd_no_tie': (SHEET_COLUMNS, 'M', 0.3),
+    'municipality_2nd_tie': (SHEET_COLUMNS, 'M', 0.15)
+}
+RESULT_COLUMNS = ['Org District', 'GP First Without Tie', 'GP First Tie', 'GP Second Without Tie', 'GP Second Tie',
+                  'Municipality First ', 'Municipality 2nd Without Tie', 'Municipality 2nd With Tie', 'Corporation 1st']
+RESULTS_2025_HEADER = [
+    ['District', 'Grama Panchayath', '', '', '', '', 'Municipality', '', '', '', '', 'Corporation', '', '', '', '', ''],
+    ['', 'Total No.', 'Won \n(including ties)', 'Opposition \n(including ties)', '2020 Won', '2025 Target',
+     'Total No.', 'Won \n(including ties)', 'Opposition \n(including ties)', '2020 Won', '2025 Target',
+     'Total No.', 'Majority', 'Won', 'Opposition', '2020', '2025 Target']
+]
+
+def sheet_row(name, columns, wards, rng):
+    share_2025, share_2024, share_2020 = (rng.uniform(10, 35) for _ in range(3))
+    won = round(wards * share_2025 / 100 * rng.uniform(0.5, 1.2))
+    votes = wards * rng.randint(400, 900)
+    values = {
+        'Org District': name,
+        'Panchayat First ': max(1, wards // 20),
+        'Total Wards 2025': wards,
+        'NDA - 2025 Result Wards': won,
+        'Target Wards': max(won, round(wards * 0.45)),
+        'NDA - 2020 Wards': round(won * rng.uniform(0.5, 1.0)),
+        'NDA 2025 Vote': round(votes * share_2025 / 100),
+        '2025 Vote Share': f"{share_2025:.2f}%",
+        'Target Vote Share': f"{share_2025 + rng.uniform(3, 12):.2f}",
+        '2024 Votes': round(votes * share_2024 / 100),
+        '2024 Vote Share': f"{share_2024:.2f}",
+        '2020 Votes': round(votes * share_2020 / 100),
+        '2020 Vote Share': f"{share_2020:.2f}"
+    }
+    return [values[column] for column in columns]
+
+def dash(value):
+    return value if value else '-'
+
+def write_csvs(output_dir, district_wards, seed):
+    """The eleven result sheets for the synthetic districts"""
+    sheets = {key: [columns] for key, (columns, _, _) in SHEETS.items()}
+    result_rows = [RESULT_COLUMNS]
+    results_2025 = [list(row) for row in RESULTS_2025_HEADER]
+    for name, wards in district_wards.items():
+        rng = edge_rng(seed, 'csv', name)
+        for key, (columns, lsgi_type, share) in SHEETS.items():
+            count = round(wards[lsgi_type] * share)
+            if count:
+                sheets[key].append(sheet_row(name, columns, count, rng))
+        local_bodies = {lsgi_type: math.ceil(count / WARDS_PER_LOCAL_BODY) for lsgi_type, count in wards.items()}
+        gp, m, c = local_bodies['G'], local_bodies['M'], local_bodies['C']
+        firsts = [rng.randint(0, max(1, gp // 10)) for _ in range(4)]
+        result_rows.append([name] + firsts + [rng.randint(0, m // 3) if m else 0 for _ in range(3)] + [rng.randint(0, c)])
+        results_2025.append([
+            name, gp, dash(firsts[0] + firsts[1]), dash(firsts[2] + firsts[3]), rng.randint(0, 2), rng.randint(0, gp // 3),
+            dash(m), '-', '-', 0, rng.randint(0, m),
+            dash(c), '-', '-', '-', '-', dash(c)
+        ])
+    result_rows.append(['Grand Total'] + [sum(row[i] for row in result_rows[1:]) for i in range(1, len(RESULT_COLUMNS))])
+
+    files = {result_sheets.csv_files[key]: rows for key, rows in sheets.items()}
+    files[result_sheets.result_csv_file] = result_rows
+    files[result_sheets.results_2025_csv_file] = results_2025
+    for filename, rows in files.items():
+        with open(output_dir / filename, 'w', encoding='utf-8', newline='') as f:
+            csv.writer(f).writerows(rows)
+
+def generate(output_dir, scale=1, total_wards=None, district_count=None, wards_per_local_body=WARDS_PER_LOCAL_BODY,
+             vertices_per_ward=VERTICES_PER_WARD, missing_local_bodies=0.05, missing_wards=0.02, seed=1):
+    """Write the synthetic data set; returns {district: ward count}"""
+    total_wards = total_wards or round(BASE_WARDS * scale)
+    district_count = min(len(result_sheets.districts), district_count or max(1, math.ceil(scale)))
+    names = result_sheets.districts[:district_count]
+    options = {'seed': seed, 'wards_per_local_body': wards_per_local_body, 'vertices_per_ward': vertices_per_ward,
+               'missing_local_bodies': missing_local_bodies, 'missing_wards': missing_wards}
+    hierarchy_dir = output_dir / result_sheets.base_dir.name
+    columns = math.ceil(math.sqrt(district_count))
+    rng = random.Random(seed)
+    district_wards = {}
+    row_height = 0
+    origin = list(ORIGIN)
+    for index, (name, wards) in enumerate(zip(names, ward_counts(total_wards, district_count))):
+        if index and index % columns == 0:
+            origin = [ORIGIN[0], origin[1] + row_height + WARD_SIZE]
+            row_height = 0
+        hierarchy, wards_by_type, extent = build_hierarchy(name, index, wards, tuple(origin), options, rng)
+        origin[0] += (extent[0] + 2) * WARD_SIZE
+        row_height = max(row_height, extent[1] * WARD_SIZE)
+        path = hierarchy_dir / name / f"{name}_hierarchy_with_geojson.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(hierarchy, f, separators=(',', ':'))
+        district_wards[name] = wards_by_type
+        print(f"  ✓ {name}: {wards} wards, {path.stat().st_size / 1e6:.1f} MB")
+    write_csvs(output_dir, district_wards, seed)
+    return {name: sum(wards.values()) for name, wards in district_wards.items()}
+
+def main():
+    parser = argparse.ArgumentParser(description="Write synthetic hierarchy files and result CSVs for scale testing")
+    parser.add_argument('--scale', type=float, default=1, help=f"multiple of the shipped {BASE_WARDS}-ward district (default: %(default)s)")
+    parser.add_argument('--output', type=Path, help="output directory (default: synthetic/<scale>x)")
+    parser.add_argument('--wards', type=int, help="total ward count, overriding --scale")
+    parser.add_argument('--districts', type=int, help=f"org districts to spread the wards over (default: scale, at most {len(result_sheets.districts)})")
+    parser.add_argument('--wards-per-local-body', type=int, default=WARDS_PER_LOCAL_BODY)
+    parser.add_argument('--vertices-per-ward', type=int, default=VERTICES_PER_WARD, help="vertex density (default: %(default)s)")
+    parser.add_argument('--missing-local-bodies', type=float, default=0.05, help="fraction of local bodies left without geometry")
+    parser.add_argument('--missing-wards', type=float, default=0.02, help="fraction of ward features dropped")
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    output_dir = args.output or Path(__file__).parent / "synthetic" / f"{args.scale:g}x"
+    output_dir.mkdir(parents=True, exist_ok=True)
+    print(f"Writing synthetic data to {output_dir}")
+    wards = generate(output_dir, args.scale, args.wards, args.districts, args.wards_per_local_body,
+                     args.vertices_per_ward, args.missing_local_bodies, args.missing_wards, args.seed)
+    print(f"✅ {len(wards)} districts, {sum(wards.values()):,} wards")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,166 @@
+        // Ensure map container exists and has dimensions
+        const mapEl = document.getElementById('map');
+        if (mapEl) {
+            if (mapEl.offsetHeight === 0) {
+                mapEl.style.height = window.innerHeight + 'px';
+            }
+            if (mapEl.offsetWidth === 0) {
+                mapEl.style.width = window.innerWidth + 'px';
+            }
+        }
+        
+        // Initialize map
+        const map = L.map('map', { 
+            center: [10.5, 76.3], 
+            zoom: 7, 
+            zoomControl: true, 
+            attributionControl: false 
+        });
+
+        const colorMapping = {
+                'Kasaragod': '#FF6B6B', 'Kannur North': '#4ECDC4', 'Kannur South': '#FFE66D',
+                'Wayanad': '#6C5CE7', 'Kozhikode City': '#FF9F43', 'Kozhikode North': '#95E1D3',
+                'Kozhikode Rural': '#F38181', 'Malappuram West': '#AA96DA', 'Malappuram Central': '#00D2D3',
+                'Malappuram East': '#FCBAD3', 'Palakkad West': '#FF85A1', 'Palakkad East': '#A8D8EA',
+                'Thrissur North': '#FFC75F', 'Thrissur City': '#845EC2', 'Thrissur South': '#B8F2E6',
+                'Ernakulam North': '#FF6F91', 'Ernakulam City': '#FFC312', 'Ernakulam East': '#17C0EB',
+                'Idukki North': '#A3CB38', 'Idukki South': '#FDA7DF', 'Kottayam West': '#12CBC4',
+                'Kottayam East': '#F79F1F', 'Alappuzha North': '#D980FA', 'Alappuzha South': '#7BED9F',
+                'Pathanamthitta': '#FF4757', 'Kollam East': '#70A1FF', 'Kollam West': '#ECCC68',
+                'Thiruvananthapuram North': '#5F27CD', 'Thiruvananthapuram City': '#48DBFB',
+                'Thiruvananthapuram South': '#FF9FF3'
+            };
+
+        const districtLayers = {};
+        let allBounds = null;
+
+        function getStyle(districtName) {
+            return { fillColor: colorMapping[districtName] || '#ccc', weight: 2, opacity: 1, color: '#ffffff', fillOpacity: 0.9 };
+        }
+
+        const HIGHLIGHT_STYLE = { weight: 3, color: '#333', fillOpacity: 1 };
+
+        function highlightFeature(e) {
+            e.target.setStyle(HIGHLIGHT_STYLE);
+            e.target.bringToFront();
+        }
+
+        function resetHighlight(e, name) {
+            e.target.setStyle(getStyle(name));
+        }
+
+        // Trend rows: one copy of the row template per year, bound to the view-model's
+        // share_<year> / votes_<year> / bar_<year> / swing_<year> fields
+        const trendRowTemplate = document.getElementById('trendRowTemplate');
+        TREND_YEARS.forEach(year => {
+            const row = trendRowTemplate.content.firstElementChild.cloneNode(true);
+            row.querySelector('.trend-year').textContent = year;
+            row.querySelectorAll('[data-trend]').forEach(el => {
+                el.getAttribute('data-trend').split(' ').forEach(binding => {
+                    const [kind, field] = binding.split(':');
+                    el.setAttribute('data-' + kind, field + '_' + year);
+                });
+            });
+            trendRowTemplate.before(row);
+        });
+
+        // Modal skeleton nodes, looked up once: opening the modal only copies a build-time
+        // view-model (modal_view.py) into them
+        const TONE_CLASSES = { up: 'change-up', down: 'change-down', flat: 'change-flat' };
+        const modalBindings = { text: [], width: [], tone: [] };
+        Object.keys(modalBindings).forEach(kind => {
+            document.querySelectorAll(`#modalOverlay [data-${kind}]`).forEach(el => {
+                modalBindings[kind].push([el, el.getAttribute('data-' + kind)]);
+            });
+        });
+
+        function openModal(district) {
+            perfMark('modal-open-start');
+            const view = district.view;
+            document.getElementById('modalBadge').style.background = colorMapping[district.name] || '#667eea';
+            modalBindings.text.forEach(([el, field]) => { el.textContent = view.text[field]; });
+            modalBindings.width.forEach(([el, field]) => { el.style.width = view.width[field]; });
+            modalBindings.tone.forEach(([el, field]) => { el.className = TONE_CLASSES[view.tone[field]] || ''; });
+            document.getElementById('modalOverlay').classList.add('active');
+            document.body.style.overflow = 'hidden';
+            perfMeasureAfterPaint('modal-open', 'modal-open-start');
+        }
+        
+        function closeModal() {
+            perfMark('modal-close-start');
+            document.getElementById('modalOverlay').classList.remove('active');
+            document.body.style.overflow = '';
+            perfMeasureAfterPaint('modal-close', 'modal-close-start');
+        }
+        
+        // Close on overlay click
+        document.getElementById('modalOverlay').addEventListener('click', function(e) {
+            if (e.target === this) closeModal();
+        });
+        
+        // Close on Escape key
+        document.addEventListener('keydown', function(e) {
+            if (e.key === 'Escape') closeModal();
+        });
+
+        function createDistrictLayer(name, geojson) {
+            return L.geoJSON(decodeGeometry(geojson), {
+                style: () => getStyle(name),
+                onEachFeature: function(feature, layer) {
+                    feature.properties = { name: name };
+                    layer.on({
+                        mouseover: highlightFeature,
+                        mouseout: (e) => resetHighlight(e, name),
+                        click: () => showDistrict(name)
+                    });
+                }
+            }).addTo(map);
+        }
+
+        function addDistrict(district) {
+            if (!(district.geojson && district.geojson.features && district.geojson.features.length > 0)) return;
+            let bounds;
+            if (MAP_RENDERER === 'canvas') {
+                bounds = districtBounds(setCanvasDistrict(district.name, district.geojson));
+            } else {
+                const layer = createDistrictLayer(district.name, district.geojson);
+                bounds = layer.getBounds();
+                districtLayers[district.name] = {
+                    layer: layer, color: colorMapping[district.name], bbox: district.geojson.bbox || boundsBBox(bounds), visible: true
+                };
+            }
+            
+            if (allBounds === null) allBounds = bounds;
+            else allBounds.extend(bounds);
+        }
+
+        // Swap a district's outline for another geometry, keeping its handlers and style
+        function replaceDistrictGeometry(name, geojson) {
+            if (MAP_RENDERER === 'canvas') {
+                setCanvasDistrict(name, geojson);
+                return;
+            }
+            const entry = districtLayers[name];
+            if (!entry) return;
+            map.removeLayer(entry.layer);
+            entry.layer = createDistrictLayer(name, geojson);
+            entry.visible = true;
+            cullDistrictLayers();
+        }
+
+        // SVG renderer: district layers whose bbox is off screen are taken off the map
+        function cullDistrictLayers() {
+            const view = boundsBBox(map.getBounds().pad(CANVAS_PADDING));
+            Object.keys(districtLayers).forEach(name => {
+                const entry = districtLayers[name];
+                const visible = bboxIntersects(entry.bbox, view);
+                if (visible === entry.visible) return;
+                entry.visible = visible;
+                if (visible) map.addLayer(entry.layer);
+                else map.removeLayer(entry.layer);
+            });
+        }
+
+        map.on('moveend', () => { if (MAP_RENDERER === 'svg') cullDistrictLayers(); });
+
+        window.addEventListener('resize', () => map.invalidateSize());
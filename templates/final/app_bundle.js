@@ -0,0 +1,9 @@
+{% include "final/perf.js" %}
+{% include "final/app.js" %}
+{% include "final/canvas_view.js" %}
+{% include "final/canvas_overview.js" %}
+{% include "final/label_layer.js" %}
+{% include "geometry_decoder.js" %}
+{% include "final/drilldown.js" %}
+{% include "final/split_loader.js" %}
+{% include "final/search.js" %}
@@ -0,0 +1,202 @@
+
+        // Canvas overview: every district is painted on one canvas instead of one SVG layer
+        // each. Hover and click are resolved by testing the pointer against each feature's
+        // precomputed bbox first and its rings only on a hit; the hovered district is
+        // repainted on a second canvas, so hovering never touches the DOM or redraws the map.
+        // Redraws skip every district and feature whose bbox is off the canvas.
+        const canvasDistricts = [];
+        let canvasView = null;
+        let hoveredDistrict = null;
+        let pendingPointer = null;
+
+        // Rings as flat Float64Arrays [x0, y0, x1, y1, ...], as the geometry worker delivers them
+        function flatRing(ring) {
+            if (ring instanceof Float64Array) return ring;
+            const values = new Float64Array(ring.length * 2);
+            ring.forEach(([x, y], i) => {
+                values[2 * i] = x;
+                values[2 * i + 1] = y;
+            });
+            return values;
+        }
+
+        function featureRings(geometry) {
+            if (!geometry) return [];
+            if (geometry.type === 'Polygon') return geometry.coordinates.map(flatRing);
+            if (geometry.type === 'MultiPolygon') return [].concat(...geometry.coordinates).map(flatRing);
+            return [];
+        }
+
+        function ringsBBox(rings) {
+            const box = [Infinity, Infinity, -Infinity, -Infinity];
+            rings.forEach(ring => {
+                for (let i = 0; i < ring.length; i += 2) {
+                    if (ring[i] < box[0]) box[0] = ring[i];
+                    if (ring[i + 1] < box[1]) box[1] = ring[i + 1];
+                    if (ring[i] > box[2]) box[2] = ring[i];
+                    if (ring[i + 1] > box[3]) box[3] = ring[i + 1];
+                }
+            });
+            return box;
+        }
+
+        function unionBBox(boxes) {
+            return boxes.reduce((box, other) => [
+                Math.min(box[0], other[0]), Math.min(box[1], other[1]),
+                Math.max(box[2], other[2]), Math.max(box[3], other[3])
+            ], [Infinity, Infinity, -Infinity, -Infinity]);
+        }
+
+        function bboxContains(box, x, y) {
+            return x >= box[0] && x <= box[2] && y >= box[1] && y <= box[3];
+        }
+
+        function bboxIntersects(a, b) {
+            return a[0] <= b[2] && b[0] <= a[2] && a[1] <= b[3] && b[1] <= a[3];
+        }
+
+        function boundsBBox(bounds) {
+            return [bounds.getWest(), bounds.getSouth(), bounds.getEast(), bounds.getNorth()];
+        }
+
+        // Even-odd test over all rings of a feature, so holes and multipolygon parts both work
+        function ringsContain(rings, x, y) {
+            let inside = false;
+            rings.forEach(ring => {
+                for (let i = 0, j = ring.length - 2; i < ring.length; j = i, i += 2) {
+                    const xi = ring[i], yi = ring[i + 1], xj = ring[j], yj = ring[j + 1];
+                    if ((yi > y) !== (yj > y) && x < (xj - xi) * (y - yi) / (yj - yi) + xi) inside = !inside;
+                }
+            });
+            return inside;
+        }
+
+        function canvasDistrict(name, geojson) {
+            const collection = geojson.encoding === 'typed' ? geojson : decodeGeometry(geojson);
+            const features = collection.features
+                .map(feature => {
+                    const rings = featureRings(feature.geometry);
+                    return { rings: rings, bbox: feature.bbox || ringsBBox(rings) };
+                })
+                .filter(feature => feature.rings.length > 0);
+            return {
+                name: name,
+                features: features,
+                bbox: geojson.bbox || unionBBox(features.map(feature => feature.bbox))
+            };
+        }
+
+        function districtBounds(entry) {
+            return L.latLngBounds([entry.bbox[1], entry.bbox[0]], [entry.bbox[3], entry.bbox[2]]);
+        }
+
+        function setCanvasDistrict(name, geojson) {
+            const entry = canvasDistrict(name, geojson);
+            const index = canvasDistricts.findIndex(other => other.name === name);
+            if (index === -1) canvasDistricts.push(entry);
+            else canvasDistricts[index] = entry;
+            if (hoveredDistrict && hoveredDistrict.name === name) hoveredDistrict = entry;
+            scheduleCanvasRedraw();
+            return entry;
+        }
+
+        // Pixel coordinates of a feature at a zoom level, cached until the zoom changes
+        function projectFeature(feature, zoom) {
+            if (feature.projectedZoom !== zoom) {
+                feature.projected = feature.rings.map(ring => {
+                    const points = new Float64Array(ring.length);
+                    for (let i = 0; i < ring.length; i += 2) {
+                        const point = map.project([ring[i + 1], ring[i]], zoom);
+                        points[i] = point.x;
+                        points[i + 1] = point.y;
+                    }
+                    return points;
+                });
+                feature.projectedZoom = zoom;
+            }
+            return feature.projected;
+        }
+
+        // Features off the canvas are neither projected nor traced
+        function traceDistrict(ctx, entry) {
+            const offset = canvasView.offset;
+            ctx.beginPath();
+            entry.features.forEach(feature => {
+                if (!bboxIntersects(feature.bbox, canvasView.bbox)) return;
+                projectFeature(feature, canvasView.zoom).forEach(points => {
+                    ctx.moveTo(points[0] - offset.x, points[1] - offset.y);
+                    for (let i = 2; i < points.length; i += 2) ctx.lineTo(points[i] - offset.x, points[i + 1] - offset.y);
+                    ctx.closePath();
+                });
+            });
+        }
+
+        function paintDistrict(ctx, entry, style) {
+            traceDistrict(ctx, entry);
+            ctx.globalAlpha = style.fillOpacity;
+            ctx.fillStyle = style.fillColor;
+            ctx.fill('evenodd');
+            ctx.globalAlpha = style.opacity;
+            ctx.lineWidth = style.weight;
+            ctx.strokeStyle = style.color;
+            ctx.lineJoin = 'round';
+            ctx.stroke();
+        }
+
+        function redrawCanvas() {
+            if (!canvasView) return;
+            positionCanvasView(canvasView);
+            const ctx = canvasContext(canvasView.base, canvasView.size);
+            canvasDistricts.forEach(entry => {
+                if (bboxIntersects(entry.bbox, canvasView.bbox)) paintDistrict(ctx, entry, getStyle(entry.name));
+            });
+            drawHighlight();
+        }
+
+        const scheduleCanvasRedraw = frameScheduler(redrawCanvas);
+
+        function drawHighlight() {
+            if (!canvasView || !canvasView.size) return;
+            const ctx = canvasContext(canvasView.highlight, canvasView.size);
+            if (hoveredDistrict) paintDistrict(ctx, hoveredDistrict, Object.assign(getStyle(hoveredDistrict.name), HIGHLIGHT_STYLE));
+        }
+
+        function districtAt(latlng) {
+            const x = latlng.lng, y = latlng.lat;
+            for (let i = canvasDistricts.length - 1; i >= 0; i--) {
+                const entry = canvasDistricts[i];
+                if (!bboxContains(entry.bbox, x, y)) continue;
+                if (entry.features.some(feature => bboxContains(feature.bbox, x, y) && ringsContain(feature.rings, x, y))) return entry;
+            }
+            return null;
+        }
+
+        function setHoveredDistrict(entry) {
+            if (entry === hoveredDistrict) return;
+            hoveredDistrict = entry;
+            map.getContainer().style.cursor = entry ? 'pointer' : '';
+            drawHighlight();
+        }
+
+        function initCanvasOverview() {
+            canvasView = createCanvasView(map.getPanes().overlayPane);
+            canvasView.base = createCanvas(canvasView, 'district-canvas');
+            canvasView.highlight = createCanvas(canvasView, 'district-canvas-highlight');
+            watchCanvasView(canvasView, scheduleCanvasRedraw);
+
+            // One hit test per animation frame, however fast the pointer events arrive
+            map.on('mousemove', e => {
+                if (pendingPointer === null) {
+                    requestAnimationFrame(() => {
+                        setHoveredDistrict(districtAt(pendingPointer));
+                        pendingPointer = null;
+                    });
+                }
+                pendingPointer = e.latlng;
+            });
+            map.on('mouseout', () => setHoveredDistrict(null));
+            map.on('click', e => {
+                const entry = districtAt(e.latlng);
+                if (entry) showDistrict(entry.name);
+            });
+        }
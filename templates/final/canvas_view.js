@@ -0,0 +1,75 @@
+
+        // Shared plumbing for the canvas layers: a container in a map pane holding canvases
+        // padded by CANVAS_PADDING of the viewport on each side. Pans move it with the pane;
+        // redraws happen on moveend / zoomend, and zoom animations scale it the way Leaflet
+        // scales its own renderers.
+        const CANVAS_PADDING = 0.5;
+
+        function createCanvasView(pane) {
+            return { container: L.DomUtil.create('div', 'leaflet-zoom-animated', pane), offset: null, center: null, zoom: null, size: null };
+        }
+
+        function createCanvas(view, className) {
+            const canvas = L.DomUtil.create('canvas', className, view.container);
+            canvas.style.position = 'absolute';
+            canvas.style.left = '0';
+            canvas.style.top = '0';
+            return canvas;
+        }
+
+        function canvasContext(canvas, size) {
+            const ratio = window.devicePixelRatio || 1;
+            canvas.width = Math.round(size.x * ratio);
+            canvas.height = Math.round(size.y * ratio);
+            canvas.style.width = size.x + 'px';
+            canvas.style.height = size.y + 'px';
+            const ctx = canvas.getContext('2d');
+            ctx.setTransform(ratio, 0, 0, ratio, 0, 0);
+            return ctx;
+        }
+
+        // Move the container to the current viewport; view.offset turns projected pixels into canvas pixels
+        // and view.bbox is the [west, south, east, north] the canvas covers, for culling
+        function positionCanvasView(view) {
+            const size = map.getSize();
+            const topLeft = map.containerPointToLayerPoint([-size.x * CANVAS_PADDING, -size.y * CANVAS_PADDING]).round();
+            L.DomUtil.setPosition(view.container, topLeft);
+            view.center = map.getCenter();
+            view.zoom = map.getZoom();
+            view.offset = map.getPixelOrigin().add(topLeft);
+            view.size = L.point(size.x * (1 + 2 * CANVAS_PADDING), size.y * (1 + 2 * CANVAS_PADDING));
+            const northWest = map.unproject(view.offset, view.zoom);
+            const southEast = map.unproject(view.offset.add(view.size), view.zoom);
+            view.bbox = [northWest.lng, southEast.lat, southEast.lng, northWest.lat];
+        }
+
+        // Same transform Leaflet applies to its own renderers while a zoom animates
+        function updateCanvasTransform(view, center, zoom) {
+            if (!view.center) return;
+            const scale = map.getZoomScale(zoom, view.zoom);
+            const viewHalf = map.getSize().multiplyBy(0.5 + CANVAS_PADDING);
+            const currentCenter = map.project(view.center, zoom);
+            const newOrigin = map.project(center, zoom).subtract(map.getSize().divideBy(2))
+                .add(L.DomUtil.getPosition(map.getPane('mapPane'))).round();
+            const topLeft = viewHalf.multiplyBy(-scale).add(currentCenter).subtract(newOrigin);
+            L.DomUtil.setTransform(view.container, topLeft, scale);
+        }
+
+        function watchCanvasView(view, redraw) {
+            map.on('moveend zoomend resize viewreset', redraw);
+            map.on('zoomanim', e => updateCanvasTransform(view, e.center, e.zoom));
+            map.on('zoom', () => updateCanvasTransform(view, map.getCenter(), map.getZoom()));
+        }
+
+        // At most one call of fn per animation frame
+        function frameScheduler(fn) {
+            let queued = false;
+            return function() {
+                if (queued) return;
+                queued = true;
+                requestAnimationFrame(() => {
+                    queued = false;
+                    fn();
+                });
+            };
+        }
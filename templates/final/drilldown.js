@@ -0,0 +1,87 @@
+
+        // Ward drilldown (split build): clicking a district fetches its local-body and ward
+        // layers and draws them with a Leaflet canvas renderer. Only the district in focus is
+        // held; zooming back out below DRILLDOWN_MIN_ZOOM removes the layers and drops the data.
+        const DRILLDOWN_MIN_ZOOM = 9;
+        const drilldownRenderer = L.canvas({ padding: 0.5 });
+        const LSGI_TYPE_NAMES = { G: 'Grama Panchayat', M: 'Municipality', C: 'Corporation' };
+        let drilldown = null;
+
+        function wardStyle() {
+            return { renderer: drilldownRenderer, fillColor: '#ffffff', fillOpacity: 0.15, weight: 0.6, opacity: 0.9, color: '#ffffff' };
+        }
+
+        function localBodyStyle() {
+            return { renderer: drilldownRenderer, fill: false, weight: 1.5, opacity: 1, color: '#333' };
+        }
+
+        // Names come from the hierarchy files, so they are set as text, never parsed as HTML
+        function wardTooltip(ward, lb) {
+            const tooltip = document.createElement('div');
+            const title = document.createElement('strong');
+            title.textContent = `Ward ${ward.ward_no}: ${ward.ward_name}`;
+            tooltip.append(
+                title, document.createElement('br'),
+                `${lb.name || ''} ${LSGI_TYPE_NAMES[lb.lsgi_type] || ''}`, document.createElement('br'),
+                `AC: ${lb.ac || '-'}`
+            );
+            return tooltip;
+        }
+
+        function drilldownLayers(name, data) {
+            const localBodies = {};
+            const outlines = L.geoJSON(decodeGeometry(data.local_bodies), {
+                renderer: drilldownRenderer,
+                style: localBodyStyle,
+                interactive: false,
+                onEachFeature: feature => { localBodies[feature.properties.code] = feature.properties; }
+            });
+            // Ward clicks stay on the ward: bubbling up to the map's click handler would reopen
+            // the district modal (canvas overview) on every ward picked while drilling in
+            const wards = L.geoJSON(decodeGeometry(data.wards), {
+                renderer: drilldownRenderer,
+                bubblingMouseEvents: false,
+                style: wardStyle,
+                onEachFeature: function(feature, layer) {
+                    const ward = feature.properties;
+                    const lb = localBodies[ward.code] || {};
+                    layer.bindTooltip(wardTooltip(ward, lb), { sticky: true });
+                    layer.on({
+                        mouseover: e => e.target.setStyle({ fillOpacity: 0.45, weight: 1.5 }),
+                        mouseout: e => e.target.setStyle(wardStyle())
+                    });
+                }
+            });
+            return { name: name, wards: wards.addTo(map), outlines: outlines.addTo(map) };
+        }
+
+        function evictDrilldown() {
+            if (!drilldown) return;
+            if (drilldown.layers) {
+                map.removeLayer(drilldown.layers.wards);
+                map.removeLayer(drilldown.layers.outlines);
+            }
+            drilldown = null;
+        }
+
+        function loadDrilldown(name) {
+            const path = overviewIndex[name] && overviewIndex[name].drilldown;
+            if (!path) return Promise.resolve();
+            if (drilldown && drilldown.name === name) return drilldown.request;
+            evictDrilldown();
+            const focus = drilldown = { name: name, layers: null };
+            focus.request = fetchGeometry(path).then(data => {
+                if (drilldown !== focus) return;
+                focus.layers = drilldownLayers(name, data);
+                const bounds = focus.layers.outlines.getBounds();
+                map.setView(bounds.getCenter(), Math.max(map.getBoundsZoom(bounds, false, L.point(40, 40)), DRILLDOWN_MIN_ZOOM));
+            }).catch(err => {
+                if (drilldown === focus) drilldown = null;
+                throw err;
+            });
+            return focus.request;
+        }
+
+        map.on('zoomend', function() {
+            if (drilldown && drilldown.layers && map.getZoom() < DRILLDOWN_MIN_ZOOM) evictDrilldown();
+        });
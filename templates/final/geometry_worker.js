@@ -0,0 +1,41 @@
+{% include "geometry_decoder.js" %}
+
+        // Geometry worker: fetches a data file, parses it and decodes every encoded ring into a
+        // Float64Array off the main thread. The arrays are transferred back, not copied, and
+        // their collections are marked encoding: 'typed'. The decode time goes back with them
+        // for the page's performance report.
+        function decodeCollection(geojson, transfer) {
+            const factor = Math.pow(10, geojson.precision);
+            geojson.features.forEach(feature => {
+                const geometry = feature.geometry;
+                if (!geometry || !(geometry.type in RING_DEPTH)) return;
+                geometry.coordinates = mapRings(geometry.coordinates, RING_DEPTH[geometry.type], encoded => {
+                    const values = decodeRingValues(encoded, factor);
+                    transfer.push(values.buffer);
+                    return values;
+                });
+            });
+            geojson.encoding = 'typed';
+        }
+
+        function decodeCollections(value, transfer) {
+            if (Array.isArray(value)) {
+                value.forEach(item => decodeCollections(item, transfer));
+            } else if (value && typeof value === 'object') {
+                if (value.encoding === 'polyline') decodeCollection(value, transfer);
+                else Object.keys(value).forEach(key => decodeCollections(value[key], transfer));
+            }
+        }
+
+        self.onmessage = function(e) {
+            const request = e.data;
+            fetch(request.url).then(response => {
+                if (!response.ok) throw new Error(request.url + ': HTTP ' + response.status);
+                return response.json();
+            }).then(data => {
+                const transfer = [];
+                const start = performance.now();
+                decodeCollections(data, transfer);
+                self.postMessage({ id: request.id, data: data, decodeMs: performance.now() - start }, transfer);
+            }).catch(err => self.postMessage({ id: request.id, error: String(err) }));
+        };
@@ -0,0 +1,19 @@
+
+        const MAP_RENDERER = '{{ map_renderer }}';
+        if (MAP_RENDERER === 'canvas') initCanvasOverview();
+
+        const districtsData = {{ districts_data }};
+        const districtsByName = {};
+        setLabels({{ labels_data }});
+
+        function showDistrict(name) {
+            openModal(districtsByName[name]);
+        }
+
+        districtsData.forEach(district => {
+            districtsByName[district.name] = district;
+            addDistrict(district);
+        });
+
+        if (allBounds) map.fitBounds(allBounds, { padding: [20, 20] });
+        perfMeasureAfterPaint('first-district-paint');
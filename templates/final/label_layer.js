@@ -0,0 +1,66 @@
+
+        // District labels, painted on one canvas from the build-time layout (label_layout.py):
+        // each label carries a bitmask of the zooms where it survived collision resolution,
+        // so a zoom change is one repaint of the visible labels and no DOM style writes.
+        let labelLayout = { zooms: [], font_sizes: [], labels: [] };
+        let labelView = null;
+
+        function labelZoomIndex(zoom) {
+            const index = Math.round(zoom) - labelLayout.zooms[0];
+            return Math.max(0, Math.min(labelLayout.zooms.length - 1, index));
+        }
+
+        function labelPoint(label, zoom) {
+            if (label.projectedZoom !== zoom) {
+                label.projected = map.project([label.position[1], label.position[0]], zoom);
+                label.projectedZoom = zoom;
+            }
+            return label.projected;
+        }
+
+        function drawLabels() {
+            if (!labelView) return;
+            positionCanvasView(labelView);
+            const ctx = canvasContext(labelView.canvas, labelView.size);
+            if (!labelLayout.labels.length) return;
+            const zoomIndex = labelZoomIndex(labelView.zoom);
+            const fontSize = labelLayout.font_sizes[zoomIndex];
+            ctx.font = `800 ${fontSize}px 'Inter', 'Segoe UI', -apple-system, BlinkMacSystemFont, sans-serif`;
+            ctx.textAlign = 'center';
+            ctx.textBaseline = 'middle';
+            ctx.lineJoin = 'round';
+            ctx.lineWidth = 4;
+            ctx.strokeStyle = '#fff';
+            ctx.fillStyle = '#1a1a2e';
+            // Lowest priority first, so the labels that matter most end up on top
+            for (let i = labelLayout.labels.length - 1; i >= 0; i--) {
+                const label = labelLayout.labels[i];
+                if (!(label.visible >> zoomIndex & 1) || !bboxContains(labelView.bbox, label.position[0], label.position[1])) continue;
+                const point = labelPoint(label, labelView.zoom);
+                const x = point.x - labelView.offset.x;
+                label.lines.forEach((line, row) => {
+                    const y = point.y - labelView.offset.y + (row - (label.lines.length - 1) / 2) * fontSize * 1.2;
+                    ctx.strokeText(line, x, y);
+                    ctx.fillText(line, x, y);
+                });
+            }
+        }
+
+        const scheduleLabelRedraw = frameScheduler(drawLabels);
+
+        function setLabels(layout) {
+            labelLayout = layout;
+            labelLayout.labels.sort((a, b) => a.priority - b.priority);
+            scheduleLabelRedraw();
+        }
+
+        function initLabelLayer() {
+            const pane = map.createPane('districtLabels');
+            pane.style.zIndex = 450;
+            pane.style.pointerEvents = 'none';
+            labelView = createCanvasView(pane);
+            labelView.canvas = createCanvas(labelView, 'district-labels');
+            watchCanvasView(labelView, scheduleLabelRedraw);
+        }
+
+        initLabelLayer();
@@ -0,0 +1,60 @@
+
+        // Real-user timings: performance marks / measures for the page's key phases, queued and
+        // sent with navigator.sendBeacon to PERF_ENDPOINT (build flag --perf-endpoint) when the
+        // page is hidden or the queue fills up. Without an endpoint nothing leaves the page, and
+        // the measures still show up in the browser's performance panel.
+        // perf_collector.py receives the beacons and reports percentiles.
+        const PERF_BATCH_SIZE = 50;
+        const perfSupported = typeof performance !== 'undefined' && !!performance.mark && !!performance.measure;
+        const perfQueue = [];
+
+        function perfRecord(name, duration) {
+            perfQueue.push([name, Math.round(duration * 10) / 10]);
+            if (perfQueue.length >= PERF_BATCH_SIZE) flushPerf();
+        }
+
+        function perfMark(name) {
+            if (perfSupported) performance.mark(name);
+        }
+
+        // From startMark (or the start of navigation) to endMark (or now)
+        function perfMeasure(name, startMark, endMark) {
+            if (!perfSupported) return;
+            performance.measure(name, startMark, endMark);
+            const entries = performance.getEntriesByName(name, 'measure');
+            if (entries.length) perfRecord(name, entries[entries.length - 1].duration);
+        }
+
+        // Measured once the browser has painted the frame the change went into
+        function perfMeasureAfterPaint(name, startMark) {
+            if (!perfSupported) return;
+            requestAnimationFrame(() => setTimeout(() => perfMeasure(name, startMark), 0));
+        }
+
+        // Main-thread geometry decoding, timed per collection
+        function decodeGeometry(geojson) {
+            if (!perfSupported) return decodeGeoJSON(geojson);
+            const start = performance.now();
+            const decoded = decodeGeoJSON(geojson);
+            perfRecord('geometry-decode', performance.now() - start);
+            return decoded;
+        }
+
+        function flushPerf() {
+            const metrics = perfQueue.splice(0);
+            if (!metrics.length || !PERF_ENDPOINT || !navigator.sendBeacon) return;
+            navigator.sendBeacon(PERF_ENDPOINT, JSON.stringify({
+                page: location.pathname,
+                renderer: MAP_RENDERER,
+                connection: navigator.connection ? navigator.connection.effectiveType : null,
+                metrics: metrics
+            }));
+        }
+
+        document.addEventListener('visibilitychange', () => {
+            if (document.visibilityState === 'hidden') flushPerf();
+        });
+        window.addEventListener('pagehide', flushPerf);
+
+        perfMark('app-start');
+        perfMeasure('shell-parse', undefined, 'app-start');
@@ -0,0 +1,159 @@
+
+        // Place search (split build): the prebuilt index (search_index.py) is fetched the first
+        // time the box is focused. A query intersects the posting lists of its grams, shortest
+        // first, and checks only the entries left; picking a result loads that one district.
+        const SEARCH_LIMIT = 8;
+        const SEARCH_KIND_ORDER = { district: 0, ac: 1, local_body: 2, ward: 3 };
+        let searchIndexPath = null;
+        let searchRequest = null;
+        let searchResults = [];
+        const searchBox = L.DomUtil.create('div', 'map-search');
+        const searchInput = L.DomUtil.create('input', '', searchBox);
+        const searchList = L.DomUtil.create('ul', 'search-results', searchBox);
+        searchInput.type = 'search';
+        searchInput.placeholder = 'Search local body, ward or AC';
+        searchInput.autocomplete = 'off';
+        searchInput.setAttribute('aria-label', 'Search places');
+
+        function searchTokens(text) {
+            return text.toLowerCase().match(/[a-z0-9]+/g) || [];
+        }
+
+        function postingIds(index, gram) {
+            if (!(gram in index.postings)) {
+                const gaps = index.grams[gram] || [];
+                const ids = new Int32Array(gaps.length);
+                let id = 0;
+                for (let i = 0; i < gaps.length; i++) ids[i] = id += gaps[i];
+                index.postings[gram] = ids;
+            }
+            return index.postings[gram];
+        }
+
+        function queryGrams(term) {
+            if (term.length < 3) return [' ' + term];
+            const grams = [];
+            for (let i = 0; i + 3 <= term.length; i++) grams.push(term.slice(i, i + 3));
+            return grams;
+        }
+
+        function intersect(lists) {
+            lists.sort((a, b) => a.length - b.length);
+            let ids = Array.from(lists[0]);
+            for (let i = 1; i < lists.length && ids.length; i++) {
+                const other = new Set(lists[i]);
+                ids = ids.filter(id => other.has(id));
+            }
+            return ids;
+        }
+
+        // Every term must start a token (short terms) or occur in one (3+ characters);
+        // terms that start a token score higher
+        function scoreEntry(entry, terms) {
+            const keys = entry.keys;
+            let score = 0;
+            for (const term of terms) {
+                if (keys.some(key => key.startsWith(term))) score += keys.includes(term) ? 3 : 2;
+                else if (term.length >= 3 && keys.some(key => key.includes(term))) score += 1;
+                else return -1;
+            }
+            return score;
+        }
+
+        function searchPlaces(index, query) {
+            const terms = searchTokens(query);
+            if (!terms.length) return [];
+            const lists = [];
+            terms.forEach(term => queryGrams(term).forEach(gram => lists.push(postingIds(index, gram))));
+            const matches = [];
+            intersect(lists).forEach(id => {
+                const entry = index.entries[id];
+                const score = scoreEntry(entry, terms);
+                if (score >= 0) matches.push({ entry: entry, score: score });
+            });
+            matches.sort((a, b) => b.score - a.score
+                || SEARCH_KIND_ORDER[a.entry.kind] - SEARCH_KIND_ORDER[b.entry.kind]
+                || a.entry.label.length - b.entry.label.length);
+            return matches.slice(0, SEARCH_LIMIT).map(match => match.entry);
+        }
+
+        function loadSearchIndex() {
+            if (!searchRequest && searchIndexPath) {
+                searchRequest = fetchJSON(searchIndexPath).then(data => ({
+                    districts: data.districts,
+                    grams: data.grams,
+                    postings: {},
+                    entries: data.entries.map(row => ({
+                        kind: row[0], label: row[1], detail: row[2], district: data.districts[row[3]],
+                        bbox: row[4], keys: row[5].split(' ')
+                    }))
+                }));
+                searchRequest.catch(err => {
+                    console.error(err);
+                    searchRequest = null;
+                });
+            }
+            return searchRequest || Promise.reject(new Error('no search index'));
+        }
+
+        function renderSearchResults(results) {
+            searchResults = results;
+            searchList.textContent = '';
+            results.forEach((entry, i) => {
+                const item = document.createElement('li');
+                const label = document.createElement('strong');
+                const detail = document.createElement('span');
+                label.textContent = entry.label;
+                detail.textContent = entry.detail + (entry.kind === 'district' ? '' : ' · ' + entry.district);
+                item.appendChild(label);
+                item.appendChild(detail);
+                item.addEventListener('mousedown', e => {
+                    e.preventDefault();
+                    selectSearchResult(i);
+                });
+                searchList.appendChild(item);
+            });
+            searchList.classList.toggle('active', results.length > 0);
+        }
+
+        function selectSearchResult(i) {
+            const entry = searchResults[i];
+            if (!entry) return;
+            renderSearchResults([]);
+            searchInput.value = entry.label;
+            searchInput.blur();
+            if (entry.kind === 'district') {
+                showDistrict(entry.district);
+                return;
+            }
+            const bbox = entry.bbox;
+            const bounds = L.latLngBounds([bbox[1], bbox[0]], [bbox[3], bbox[2]]);
+            loadDrilldown(entry.district).then(() => {
+                map.setView(bounds.getCenter(), Math.max(map.getBoundsZoom(bounds, false, L.point(40, 40)), DRILLDOWN_MIN_ZOOM));
+            }).catch(err => console.error(err));
+        }
+
+        searchInput.addEventListener('focus', () => { loadSearchIndex().catch(() => {}); });
+        searchInput.addEventListener('input', () => {
+            const query = searchInput.value;
+            loadSearchIndex().then(index => {
+                if (searchInput.value === query) renderSearchResults(searchPlaces(index, query));
+            }).catch(() => {});
+        });
+        searchInput.addEventListener('keydown', e => {
+            if (e.key === 'Enter') selectSearchResult(0);
+            else if (e.key === 'Escape') renderSearchResults([]);
+        });
+        searchInput.addEventListener('blur', () => renderSearchResults([]));
+
+        function initSearch(path) {
+            searchIndexPath = path;
+            if (!path) return;
+            const control = L.control({ position: 'topleft' });
+            control.onAdd = () => {
+                L.DomEvent.disableClickPropagation(searchBox);
+                L.DomEvent.disableScrollPropagation(searchBox);
+                return searchBox;
+            };
+            control.addTo(map);
+        }
@@ -0,0 +1,63 @@
+
+        // Service worker for the split build, regenerated with every build (service_worker.py)
+        const BUILD_VERSION = '{{ build_version }}';
+        const CACHE_PREFIX = '{{ cache_prefix }}';
+        const PRECACHE_CACHE = CACHE_PREFIX + '-precache-' + BUILD_VERSION;
+        const DATA_CACHE = CACHE_PREFIX + '-data-' + BUILD_VERSION;
+        const PRECACHE_URLS = {{ precache_urls }}.map(path => new URL(path, self.location).href);
+        const SCOPE = new URL('./', self.location);
+        const SHELL_URL = SCOPE.href;
+        const SHELL_PATHS = [SCOPE.pathname, SCOPE.pathname + 'index.html'];
+        // Result data: content-hashed data files and the static API
+        const DATA_PREFIXES = ['data/', 'api/'].map(path => new URL(path, SCOPE).href);
+
+        self.addEventListener('install', event => {
+            event.waitUntil(caches.open(PRECACHE_CACHE).then(cache => cache.addAll(PRECACHE_URLS)));
+        });
+
+        self.addEventListener('activate', event => {
+            event.waitUntil(caches.keys().then(keys => Promise.all(keys
+                .filter(key => key.startsWith(CACHE_PREFIX + '-') && key !== PRECACHE_CACHE && key !== DATA_CACHE)
+                .map(key => caches.delete(key))
+            )).then(() => self.clients.claim()));
+        });
+
+        function cacheFirst(request, cacheName) {
+            return caches.open(cacheName).then(cache => cache.match(request).then(cached => cached || fetch(request)));
+        }
+
+        // The latest shell whenever the network answers, so a deploy shows on the next load;
+        // the cached copy only offline or on a server error
+        function networkFirst(request, cacheName) {
+            return caches.open(cacheName).then(cache => fetch(request).then(response => {
+                if (response.ok) return cache.put(request, response.clone()).then(() => response);
+                return cache.match(request).then(cached => cached || response);
+            }, () => cache.match(request).then(cached => cached || Response.error())));
+        }
+
+        // Answer from the cache at once and refresh the entry in the background;
+        // the network is only waited for when nothing is cached yet
+        function staleWhileRevalidate(event, request, cacheName) {
+            return caches.open(cacheName).then(cache => cache.match(request).then(cached => {
+                const update = fetch(request).then(response => {
+                    if (response.ok) return cache.put(request, response.clone()).then(() => response);
+                    return response;
+                });
+                if (!cached) return update;
+                event.waitUntil(update.catch(() => {}));
+                return cached;
+            }));
+        }
+
+        self.addEventListener('fetch', event => {
+            const request = event.request;
+            if (request.method !== 'GET') return;
+            const url = new URL(request.url);
+            if (request.mode === 'navigate' && url.origin === SCOPE.origin && SHELL_PATHS.includes(url.pathname)) {
+                event.respondWith(networkFirst(SHELL_URL, PRECACHE_CACHE));
+            } else if (PRECACHE_URLS.includes(request.url)) {
+                event.respondWith(cacheFirst(request.url, PRECACHE_CACHE));
+            } else if (DATA_PREFIXES.some(prefix => request.url.startsWith(prefix))) {
+                event.respondWith(staleWhileRevalidate(event, request, DATA_CACHE));
+            }
+        });
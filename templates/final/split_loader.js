@@ -0,0 +1,134 @@
+
+        const overviewIndex = {};
+        const viewRequests = {};
+        const districtDetail = {};
+
+        function fetchJSON(path) {
+            return fetch(DATA_BASE + path).then(response => {
+                if (!response.ok) throw new Error(path + ': HTTP ' + response.status);
+                return response.json();
+            });
+        }
+
+        // Geometry files are fetched and decoded by a worker when the browser can start one;
+        // otherwise (or once the worker fails) they are fetched on the main thread
+        let geometryWorker = null;
+        const workerRequests = {};
+        let workerRequestId = 0;
+        try {
+            if (typeof Worker !== 'undefined' && GEOMETRY_WORKER_PATH) geometryWorker = new Worker(GEOMETRY_WORKER_PATH);
+        } catch (err) {
+            console.error(err);
+        }
+        if (geometryWorker) {
+            geometryWorker.onmessage = function(e) {
+                const request = workerRequests[e.data.id];
+                delete workerRequests[e.data.id];
+                if (e.data.decodeMs !== undefined) perfRecord('geometry-decode', e.data.decodeMs);
+                if (e.data.error) request.reject(new Error(e.data.error));
+                else request.resolve(e.data.data);
+            };
+            geometryWorker.onerror = function(e) {
+                console.error(e.message || e);
+                geometryWorker = null;
+                Object.keys(workerRequests).forEach(id => {
+                    fetchJSON(workerRequests[id].path).then(workerRequests[id].resolve, workerRequests[id].reject);
+                    delete workerRequests[id];
+                });
+            };
+        }
+
+        function fetchGeometry(path) {
+            if (!geometryWorker) return fetchJSON(path);
+            return new Promise((resolve, reject) => {
+                const id = ++workerRequestId;
+                workerRequests[id] = { path: path, resolve: resolve, reject: reject };
+                geometryWorker.postMessage({ id: id, url: new URL(DATA_BASE + path, location.href).href });
+            });
+        }
+
+        function loadDistrictView(name) {
+            if (!viewRequests[name]) viewRequests[name] = fetchJSON(overviewIndex[name].view);
+            return viewRequests[name];
+        }
+
+        // Level of detail: level 0 is the overview outline, the others come from overview.json
+        // lods ({zoom, path}, coarse to full). After every move each district on screen is
+        // swapped to the finest level its zoom allows; a level is fetched the first time it is
+        // needed and kept, so zooming back out swaps without a request.
+        function initDistrictDetail(district) {
+            districtDetail[district.name] = {
+                bbox: district.geojson.bbox,
+                levels: [{ zoom: 0, geojson: district.geojson }].concat((district.lods || []).map(lod => ({ zoom: lod.zoom, path: lod.path }))),
+                shown: 0,
+                wanted: 0
+            };
+        }
+
+        function detailLevel(levels, zoom) {
+            let index = 0;
+            levels.forEach((level, i) => { if (zoom >= level.zoom) index = i; });
+            return index;
+        }
+
+        function loadDetailLevel(level) {
+            if (!level.request) {
+                level.request = level.geojson ? Promise.resolve(level.geojson) : fetchGeometry(level.path).then(geojson => {
+                    level.geojson = geojson;
+                    return geojson;
+                });
+                level.request.catch(() => { level.request = null; });
+            }
+            return level.request;
+        }
+
+        function updateDistrictDetail() {
+            const zoom = map.getZoom();
+            const view = boundsBBox(map.getBounds());
+            Object.keys(districtDetail).forEach(name => {
+                const detail = districtDetail[name];
+                if (detail.bbox && !bboxIntersects(detail.bbox, view)) return;
+                const index = detailLevel(detail.levels, zoom);
+                if (index === detail.wanted) return;
+                detail.wanted = index;
+                loadDetailLevel(detail.levels[index]).then(geojson => {
+                    if (detail.wanted !== index || detail.shown === index) return;
+                    detail.shown = index;
+                    replaceDistrictGeometry(name, geojson);
+                }).catch(err => {
+                    console.error(err);
+                    if (detail.wanted === index) detail.wanted = detail.shown;
+                });
+            });
+        }
+
+        map.on('moveend', updateDistrictDetail);
+
+        // The outline detail follows the zoom the drilldown sets
+        function showDistrict(name) {
+            loadDistrictView(name).then(openModal).catch(err => console.error(err));
+            loadDrilldown(name).catch(err => console.error(err));
+        }
+
+        // Offline support and instant repeat visits (service_worker.py)
+        if ('serviceWorker' in navigator && SERVICE_WORKER_PATH) {
+            window.addEventListener('load', () => {
+                navigator.serviceWorker.register(SERVICE_WORKER_PATH).catch(err => console.error(err));
+            });
+        }
+
+        if (MAP_RENDERER === 'canvas') initCanvasOverview();
+
+        perfMark('data-fetch-start');
+        fetchGeometry(OVERVIEW_PATH).then(overview => {
+            perfMeasure('data-fetch', 'data-fetch-start');
+            setLabels(overview.labels);
+            initSearch(overview.search);
+            overview.districts.forEach(district => {
+                overviewIndex[district.name] = district;
+                initDistrictDetail(district);
+                addDistrict(district);
+            });
+            if (allBounds) map.fitBounds(allBounds, { padding: [20, 20] });
+            perfMeasureAfterPaint('first-district-paint');
+        }).catch(err => console.error(err));
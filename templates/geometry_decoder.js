@@ -0,0 +1,52 @@
+
+        const RING_DEPTH = { LineString: 0, Polygon: 1, MultiLineString: 1, MultiPolygon: 2 };
+
+        // One encoded ring -> Float64Array [x0, y0, x1, y1, ...]
+        function decodeRingValues(encoded, factor) {
+            const values = new Float64Array(encoded.length);
+            let index = 0, count = 0, x = 0, y = 0;
+            while (index < encoded.length) {
+                for (let axis = 0; axis < 2; axis++) {
+                    let result = 0, shift = 0, byte;
+                    do {
+                        byte = encoded.charCodeAt(index++) - 63;
+                        result |= (byte & 0x1f) << shift;
+                        shift += 5;
+                    } while (byte >= 0x20);
+                    const delta = (result & 1) ? ~(result >> 1) : (result >> 1);
+                    if (axis === 0) x += delta; else y += delta;
+                }
+                values[count++] = x / factor;
+                values[count++] = y / factor;
+            }
+            return values.slice(0, count);
+        }
+
+        function ringPoints(values) {
+            const points = [];
+            for (let i = 0; i < values.length; i += 2) points.push([values[i], values[i + 1]]);
+            return points;
+        }
+
+        function mapRings(coordinates, depth, transform) {
+            return depth === 0 ? transform(coordinates) : coordinates.map(part => mapRings(part, depth - 1, transform));
+        }
+
+        // Encoded FeatureCollection -> GeoJSON (plain GeoJSON passes through). 'typed' collections
+        // come from the geometry worker with every ring already decoded into a Float64Array.
+        function decodeGeoJSON(geojson) {
+            if (!geojson || (geojson.encoding !== 'polyline' && geojson.encoding !== 'typed')) return geojson;
+            const factor = Math.pow(10, geojson.precision);
+            const decode = geojson.encoding === 'typed' ? ringPoints : (ring => ringPoints(decodeRingValues(ring, factor)));
+            return {
+                type: 'FeatureCollection',
+                bbox: geojson.bbox,
+                features: geojson.features.map(feature => {
+                    const geometry = feature.geometry;
+                    if (!geometry || !(geometry.type in RING_DEPTH)) return feature;
+                    return Object.assign({}, feature, {
+                        geometry: { type: geometry.type, coordinates: mapRings(geometry.coordinates, RING_DEPTH[geometry.type], decode) }
+                    });
+                })
+            };
+        }
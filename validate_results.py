@@ -0,0 +1,302 @@
+"""
+Statewide consistency checker for the result sheets and hierarchy files.
+
+All sources are indexed once (every sheet by org district including its
+Grand Total row, Result.csv, Results-2025 - Sheet1.csv and one membership row
+per local body in the hierarchy files), then every check runs over those
+indexes in a single pass:
+
+  * sheet totals      - district rows add up to the Grand Total / Total row
+  * sheet values      - count/vote columns are numeric, result wards <= total wards
+  * cross-sheet       - Result.csv counts agree with the category sheets and
+                        with the won/opposition columns of Results-2025
+  * build coverage    - every Results-2025 district reaches the page
+  * geometry vs table - local bodies and wards in the hierarchy agree with the
+                        sheets and with their own feature counts
+
+Errors fail the gate; warnings are reported. Run it on its own before
+publishing, or via `generate_kerala_map_final.py --validate`.
+"""
+import argparse
+import contextlib
+import csv
+import io
+import json
+import sys
+import time
+
+import build_manifest
+import rollups
+from result_sheets import (
+    csv_dir, csv_files, districts, hierarchy_path, load_results_2025_data,
+    result_csv_file, results_2025_csv_file
+)
+
+# Columns summed against the Grand Total row, with the absolute tolerance allowed
+# (vote columns are exported from a spreadsheet that rounds fractional totals)
+TOTAL_COLUMNS = {
+    'Total Wards 2025': 0,
+    'NDA - 2025 Result Wards': 0,
+    'Target Wards': 0,
+    'NDA - 2020 Wards': 0,
+    'NDA 2025 Vote': 1,
+    '2024 Votes': 1,
+    '2020 Votes': 1
+}
+
+# Sheets listing only the local bodies counted in one Result.csv column
+RESULT_COLUMN_SHEETS = {
+    'od_panchayat_first_no_tie': 'GP First Without Tie',
+    'od_panchayat_first_tie': 'GP First Tie',
+    'od_panchayat_second_no_tie': 'GP Second Without Tie',
+    'od_panchayat_second_tie': 'GP Second Tie',
+    'municipality_2nd_no_tie': 'Municipality 2nd Without Tie',
+    'municipality_2nd_tie': 'Municipality 2nd With Tie'
+}
+
+# Results-2025 - Sheet1.csv column positions (row 0-1 are headers)
+RESULTS_2025_COLUMNS = {
+    'gp_total': 1, 'gp_won': 2, 'gp_opposition': 3,
+    'm_total': 6, 'm_won': 7, 'm_opposition': 8,
+    'c_total': 11, 'c_won': 13
+}
+
+# Results-2025 won/opposition columns -> (Result.csv columns that should sum to them, severity).
+# "Opposition" is counted slightly differently in the two sheets, so it only warns.
+RESULTS_2025_CROSS_CHECKS = {
+    'gp_won': (['GP First Without Tie', 'GP First Tie'], 'error'),
+    'gp_opposition': (['GP Second Without Tie', 'GP Second Tie'], 'warning'),
+    'm_won': (['Municipality First '], 'error'),
+    'm_opposition': (['Municipality 2nd Without Tie', 'Municipality 2nd With Tie'], 'warning'),
+    'c_won': (['Corporation 1st'], 'error')
+}
+
+# lsgi_type -> (Results-2025 total column, sheet holding that category's wards)
+HIERARCHY_CATEGORIES = {
+    'G': ('gp_total', 'org_panchayat_30'),
+    'M': ('m_total', 'municipality'),
+    'C': ('c_total', 'corporation')
+}
+
+def parse_count(value):
+    """Parse '1,448' / '-' / '' into a number; None when the cell is not a count"""
+    cleaned = (value or '').replace(',', '').strip()
+    if cleaned in ('', '-', 'NA', 'N/A'):
+        return 0
+    try:
+        return float(cleaned)
+    except ValueError:
+        return None
+
+def read_sheet(path):
+    """Rows keyed by org district, plus the Grand Total row"""
+    rows, total = {}, None
+    with open(path, 'r', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            org_district = (row.get('Org District') or '').strip()
+            if org_district == 'Grand Total':
+                total = row
+            elif org_district:
+                rows[org_district] = row
+    return rows, total
+
+def read_results_2025(path):
+    rows, total = {}, None
+    with open(path, 'r', encoding='utf-8') as f:
+        for row in list(csv.reader(f))[2:]:
+            if not row or not row[0].strip():
+                continue
+            values = {key: parse_count(row[i]) if i < len(row) else 0 for key, i in RESULTS_2025_COLUMNS.items()}
+            if row[0].strip() == 'Total':
+                total = values
+            else:
+                rows[row[0].strip()] = values
+    return rows, total
+
+def load_memberships():
+    """Membership rows per district, from the build cache when the hierarchy file is unchanged"""
+    manifest = build_manifest.load_manifest()
+    memberships = {}
+    for district_name in districts:
+        json_file = hierarchy_path(district_name)
+        if not json_file.exists():
+            continue
+        previous = manifest['files'].get(build_manifest.file_key(json_file))
+        membership = None
+        if previous and build_manifest.hash_file(json_file, previous)['hash'] == previous['hash']:
+            membership = build_manifest.load_record(district_name, kind='membership')
+        if membership is None:
+            with open(json_file, 'r', encoding='utf-8') as f:
+                membership = rollups.extract_membership(district_name, json.load(f))
+        memberships[district_name] = membership
+    return memberships
+
+def build_index():
+    """Index every source once"""
+    sheets = {}
+    for key, filename in csv_files.items():
+        if (csv_dir / filename).exists():
+            sheets[key] = read_sheet(csv_dir / filename)
+    result_rows, result_total = read_sheet(csv_dir / result_csv_file)
+    results_2025_rows, results_2025_total = read_results_2025(csv_dir / results_2025_csv_file)
+
+    memberships = load_memberships()
+    hierarchy = {}
+    for district_name, rows in memberships.items():
+        for row in rows:
+            entry = hierarchy.setdefault((district_name, row['lsgi_type']), {'local_bodies': 0, 'wards': 0, 'features': 0})
+            entry['local_bodies'] += 1
+            entry['wards'] += row['ward_count']
+            entry['features'] += row['feature_count']
+
+    return {
+        'sheets': sheets,
+        'result': (result_rows, result_total),
+        'results_2025': (results_2025_rows, results_2025_total),
+        'memberships': memberships,
+        'hierarchy': hierarchy
+    }
+
+def issue(severity, check, source, district, message):
+    return {'severity': severity, 'check': check, 'source': source, 'district': district, 'message': message}
+
+def check_totals(source, rows, total, columns):
+    """District rows must add up to the total row; cells must be numeric"""
+    issues = []
+    if total is None:
+        return [issue('error', 'sheet_totals', source, None, "no Grand Total row")]
+    for column, tolerance in columns.items():
+        if column not in total:
+            continue
+        column_sum = 0
+        for district_name, row in rows.items():
+            value = parse_count(row.get(column))
+            if value is None:
+                issues.append(issue('error', 'sheet_values', source, district_name, f"'{column}' is not a count: {row.get(column)!r}"))
+                continue
+            column_sum += value
+        expected = parse_count(total.get(column))
+        if expected is None:
+            issues.append(issue('error', 'sheet_values', source, 'Grand Total', f"'{column}' is not a count: {total.get(column)!r}"))
+        elif abs(column_sum - expected) > tolerance:
+            issues.append(issue('error', 'sheet_totals', source, None, f"'{column}' rows sum to {column_sum:g}, Grand Total says {expected:g}"))
+    return issues
+
+def validate(index, results_2025_data=None):
+    """Run every check over the prebuilt index; returns a list of issues"""
+    issues = []
+    known = set(districts)
+    result_rows, result_total = index['result']
+    results_2025_rows, results_2025_total = index['results_2025']
+
+    # Sheet totals, values and district names
+    for key, (rows, total) in index['sheets'].items():
+        source = csv_files[key]
+        issues.extend(check_totals(source, rows, total, TOTAL_COLUMNS))
+        for district_name, row in rows.items():
+            if district_name not in known:
+                issues.append(issue('error', 'district_names', source, district_name, "unknown org district"))
+            won, wards = parse_count(row.get('NDA - 2025 Result Wards')), parse_count(row.get('Total Wards 2025'))
+            if won is not None and wards is not None and won > wards:
+                issues.append(issue('error', 'sheet_values', source, district_name, f"{won:g} NDA wards of {wards:g} total"))
+    issues.extend(check_totals(result_csv_file, result_rows, result_total, {column: 0 for column in (result_total or {}) if column != 'Org District'}))
+    if results_2025_total is None:
+        issues.append(issue('error', 'sheet_totals', results_2025_csv_file, None, "no Total row"))
+    else:
+        for column in RESULTS_2025_COLUMNS:
+            column_sum = sum(row[column] or 0 for row in results_2025_rows.values())
+            if column_sum != results_2025_total[column]:
+                issues.append(issue('error', 'sheet_totals', results_2025_csv_file, None, f"'{column}' rows sum to {column_sum:g}, Total says {results_2025_total[column]:g}"))
+
+    # Cross-sheet counts: Result.csv vs category sheets vs Results-2025
+    for district_name, result_row in result_rows.items():
+        if district_name not in known:
+            issues.append(issue('error', 'district_names', result_csv_file, district_name, "unknown org district"))
+        for key, column in RESULT_COLUMN_SHEETS.items():
+            count = parse_count(result_row.get(column)) or 0
+            listed = district_name in index['sheets'].get(key, ({}, None))[0]
+            if (count > 0) != listed:
+                issues.append(issue('error', 'cross_sheet', csv_files[key], district_name,
+                                    f"Result.csv '{column.strip()}' is {count:g} but the district is {'listed' if listed else 'missing'}"))
+        first_no_tie = index['sheets'].get('od_panchayat_first_no_tie', ({}, None))[0].get(district_name)
+        if first_no_tie and parse_count(first_no_tie.get('Panchayat First ')) != parse_count(result_row.get('GP First Without Tie')):
+            issues.append(issue('error', 'cross_sheet', csv_files['od_panchayat_first_no_tie'], district_name,
+                                f"'Panchayat First' is {first_no_tie.get('Panchayat First ')} but Result.csv says {result_row.get('GP First Without Tie')}"))
+        row_2025 = results_2025_rows.get(district_name)
+        if row_2025 is None:
+            issues.append(issue('error', 'cross_sheet', results_2025_csv_file, district_name, "district missing"))
+            continue
+        for column, (result_columns, severity) in RESULTS_2025_CROSS_CHECKS.items():
+            expected = sum(parse_count(result_row.get(c)) or 0 for c in result_columns)
+            if (row_2025[column] or 0) != expected:
+                issues.append(issue(severity, 'cross_sheet', results_2025_csv_file, district_name,
+                                    f"'{column}' is {row_2025[column] or 0:g} but Result.csv gives {expected:g}"))
+
+    # Every Results-2025 district must survive the build's loader (its progress lines are not part of the report)
+    loaded = results_2025_data
+    if loaded is None:
+        with contextlib.redirect_stdout(io.StringIO()):
+            loaded = load_results_2025_data()
+    for district_name in results_2025_rows:
+        if district_name not in loaded:
+            issues.append(issue('error', 'build_coverage', results_2025_csv_file, district_name,
+                                "row is skipped by load_results_2025_data, the page shows 0 local bodies"))
+
+    # Geometry vs table counts
+    for district_name in districts:
+        if district_name not in index['memberships']:
+            issues.append(issue('warning', 'geometry', 'hierarchy', district_name, "no hierarchy file"))
+            continue
+        row_2025 = results_2025_rows.get(district_name, {})
+        for lsgi_type, (total_column, sheet_key) in HIERARCHY_CATEGORIES.items():
+            entry = index['hierarchy'].get((district_name, lsgi_type), {'local_bodies': 0, 'wards': 0, 'features': 0})
+            expected_bodies = row_2025.get(total_column) or 0
+            if entry['local_bodies'] != expected_bodies:
+                issues.append(issue('warning', 'geometry', 'hierarchy', district_name,
+                                    f"{entry['local_bodies']} '{lsgi_type}' local bodies in the hierarchy, Results-2025 lists {expected_bodies:g}"))
+            sheet_row = index['sheets'].get(sheet_key, ({}, None))[0].get(district_name)
+            sheet_wards = parse_count(sheet_row.get('Total Wards 2025')) if sheet_row else 0
+            if sheet_wards is not None and entry['wards'] != sheet_wards:
+                issues.append(issue('warning', 'geometry', 'hierarchy', district_name,
+                                    f"{entry['wards']} '{lsgi_type}' wards in the hierarchy, '{csv_files[sheet_key]}' lists {sheet_wards:g}"))
+        for row in index['memberships'][district_name]:
+            if row['feature_count'] != row['ward_count']:
+                issues.append(issue('warning', 'geometry', 'hierarchy', district_name,
+                                    f"{row['name']} ({row['code']}) has ward_count {row['ward_count']} but {row['feature_count']} ward polygons"))
+            if row.get('distinct_ward_numbers', row['feature_count']) != row['feature_count']:
+                issues.append(issue('warning', 'geometry', 'hierarchy', district_name,
+                                    f"{row['name']} ({row['code']}) repeats Ward_No across {row['feature_count']} polygons"))
+    return issues
+
+def print_report(issues, elapsed_ms):
+    errors = [i for i in issues if i['severity'] == 'error']
+    warnings = [i for i in issues if i['severity'] == 'warning']
+    for entry in errors + warnings:
+        mark = '✗' if entry['severity'] == 'error' else '!'
+        where = f"{entry['district']}: " if entry['district'] else ''
+        print(f"  {mark} [{entry['check']}] {entry['source']}: {where}{entry['message']}")
+    status = '✗' if errors else '✓'
+    print(f"{status} Validation: {len(errors)} errors, {len(warnings)} warnings ({elapsed_ms:.1f} ms)")
+
+def run(results_2025_data=None):
+    """Index, validate and print; returns the issue list. The build passes the sheet it already loaded"""
+    start = time.perf_counter()
+    issues = validate(build_index(), results_2025_data)
+    print_report(issues, (time.perf_counter() - start) * 1000)
+    return issues
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the result sheets and hierarchy files for consistency")
+    parser.add_argument('--strict', action='store_true', help="fail on warnings as well as errors")
+    parser.add_argument('--json', metavar='PATH', help="write the issues as a JSON report")
+    args = parser.parse_args()
+
+    issues = run()
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(issues, f, indent=2, ensure_ascii=False)
+    failing = [i for i in issues if args.strict or i['severity'] == 'error']
+    sys.exit(1 if failing else 0)
+
+if __name__ == '__main__':
+    main()